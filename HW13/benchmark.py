@@ -0,0 +1,558 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the Students API storage layer.
+
+Every benchmark works on a temporary database, students.db is never touched.
+
+Usage:
+    python benchmark.py csv-import --rows 1000000 10000000 --workers 1 2 4 8
+    python benchmark.py indexes --rows 1000000 10000000
+    python benchmark.py load-test --url http://localhost:8000 --concurrency 1 16 64
+    python benchmark.py sync-vs-async --rows 20000 --concurrency 1 16 64
+    python benchmark.py cache-codecs --rows 100000
+    python benchmark.py verify-token --sessions 100000
+    python benchmark.py login --kdf pbkdf2_sha256 --cost 100000 200000 --concurrency 1 16 64
+"""
+
+import sys
+sys.stdout.reconfigure(encoding='utf-8')
+
+import argparse
+import asyncio
+import csv
+import os
+import random
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Optional, Tuple
+
+import requests
+
+from sqlalchemy import text
+
+import main as api
+from main import (StudentManager, AsyncStudentManager, Student, IMPORT_WORKERS, migrate_schema,
+                  CacheManager, CACHE_CODECS, STUDENT_LIST_ADAPTER,
+                  AuthManager, AsyncAuthManager, PasswordHasher, PasswordHashingBusy, TokenCache,
+                  Session, User, ACCESS_TOKEN_LIFETIME, REFRESH_TOKEN_LIFETIME,
+                  PASSWORD_KDF_DEFAULT_COSTS, PASSWORD_HASH_WORKERS, PASSWORD_HASH_QUEUE_LIMIT)
+
+LAST_NAMES = ['Ли', 'Ким', 'Райт', 'Джонс', 'Иванов', 'Петров', 'Смирнов', 'Кузнецов']
+FIRST_NAMES = ['Иван', 'Петр', 'Вероника', 'Андрей', 'Мария', 'Анна', 'Олег', 'Елена']
+FACULTIES = ['АВТФ', 'ФПМИ', 'ФЛА', 'РЭФ', 'ФТФ', 'ФБ', 'МТФ', 'ЮФ']
+COURSES = ['Теор. Механика', 'Мат. Анализ', 'Физика', 'Программирование',
+           'Философия', 'Экономика', 'Линейная алгебра', 'История']
+
+
+# ============================================================================
+# Helpers
+# ============================================================================
+
+def make_synthetic_csv(path: str, rows: int, seed: int = 42) -> None:
+    """Write a students CSV with the given number of random rows"""
+    rnd = random.Random(seed)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Фамилия', 'Имя', 'Факультет', 'Курс', 'Оценка'])
+        for _ in range(rows):
+            writer.writerow([
+                rnd.choice(LAST_NAMES),
+                rnd.choice(FIRST_NAMES),
+                rnd.choice(FACULTIES),
+                rnd.choice(COURSES),
+                rnd.randint(0, 100)
+            ])
+
+
+def temp_manager(workdir: str, name: str) -> StudentManager:
+    """Create a StudentManager on a fresh database inside workdir"""
+    return StudentManager(f"sqlite:///{os.path.join(workdir, name)}")
+
+
+def timed(func, *args, **kwargs):
+    """Run func and return (result, elapsed seconds)"""
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+
+# ============================================================================
+# CSV import
+# ============================================================================
+
+def orm_import(manager: StudentManager, csv_file: str) -> int:
+    """Row-by-row ORM import, the way populate_from_csv used to work"""
+    session = manager.Session()
+    try:
+        count = 0
+        with open(csv_file, 'r', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                session.add(Student(**StudentManager.parse_csv_row(row)))
+                count += 1
+        session.commit()
+        return count
+    finally:
+        session.close()
+
+
+def bench_csv_import(rows_list, skip_orm: bool = False, workers_list=None) -> None:
+    """Compare ORM row-by-row import with the bulk insert engine
+
+    The streaming import is run once per parser process count. Files under
+    PARALLEL_IMPORT_MIN_BYTES are always parsed in-process, the reported
+    parser count shows what was actually used.
+    """
+    for rows in rows_list:
+        with tempfile.TemporaryDirectory() as workdir:
+            csv_file = os.path.join(workdir, 'students.csv')
+            make_synthetic_csv(csv_file, rows)
+            print(f"\nCSV import, {rows} rows")
+
+            if not skip_orm:
+                count, elapsed = timed(orm_import, temp_manager(workdir, 'orm.db'), csv_file)
+                print(f"  ORM session.add : {elapsed:8.2f} s  {count / elapsed:12.0f} rows/s")
+
+            stats = temp_manager(workdir, 'bulk.db').populate_from_csv(csv_file)
+            print(f"  bulk insert     : {stats['elapsed_seconds']:8.2f} s  "
+                  f"{stats['rows_per_second']:12.0f} rows/s")
+
+            for workers in sorted(set(workers_list or (1, IMPORT_WORKERS))):
+                stats = temp_manager(workdir, f'stream_{workers}.db').import_csv_stream(csv_file, workers=workers)
+                label = f"stream, {stats['parser_workers']} parser(s)"
+                print(f"  {label:<16}: {stats['elapsed_seconds']:8.2f} s  "
+                      f"{stats['rows_per_second']:12.0f} rows/s")
+
+
+# ============================================================================
+# Secondary indexes
+# ============================================================================
+
+def bench_query(func, *args, repeat: int = 5) -> float:
+    """Best time of several runs in milliseconds"""
+    return min(timed(func, *args)[1] for _ in range(repeat)) * 1000
+
+
+def query_timings(manager: StudentManager, repeat: int) -> dict:
+    """Time every query the indexes are meant for"""
+    return {
+        'get_students_by_faculty': bench_query(manager.get_students_by_faculty, FACULTIES[0], repeat=repeat),
+        'get_unique_courses': bench_query(manager.get_unique_courses, repeat=repeat),
+        'get_average_score_by_faculty': bench_query(manager.get_average_score_by_faculty, FACULTIES[0], repeat=repeat),
+        'get_low_score_students_by_course': bench_query(manager.get_low_score_students_by_course, COURSES[0], 5, repeat=repeat),
+    }
+
+
+def bench_indexes(rows_list, repeat: int = 5) -> None:
+    """Compare query times on the students table without and with secondary indexes"""
+    for rows in rows_list:
+        with tempfile.TemporaryDirectory() as workdir:
+            csv_file = os.path.join(workdir, 'students.csv')
+            make_synthetic_csv(csv_file, rows)
+            manager = temp_manager(workdir, 'indexes.db')
+            manager.populate_from_csv(csv_file)
+
+            with manager.engine.begin() as conn:
+                for index in Student.__table__.indexes:
+                    conn.execute(text(f'DROP INDEX {index.name}'))
+            before = query_timings(manager, repeat)
+
+            migrated, elapsed = timed(migrate_schema, manager.engine)
+            after = query_timings(manager, repeat)
+
+            print(f"\nSecondary indexes, {rows} rows (created {', '.join(migrated)} in {elapsed:.2f} s)")
+            print(f"  {'query':<34}{'no index, ms':>14}{'indexed, ms':>14}{'speedup':>10}")
+            for name in before:
+                print(f"  {name:<34}{before[name]:14.2f}{after[name]:14.2f}{before[name] / after[name]:9.1f}x")
+
+
+# ============================================================================
+# HTTP load test
+# ============================================================================
+
+def get_load_test_token(base_url: str) -> str:
+    """Register (if needed) and log in the load test user"""
+    credentials = {"username": "load_test_user", "password": "load_test_password"}
+    requests.post(f"{base_url}/auth/register",
+                  json={**credentials, "email": "load_test_user@example.com"}, timeout=10)
+    response = requests.post(f"{base_url}/auth/login", json=credentials, timeout=10)
+    response.raise_for_status()
+    return response.json()['access_token']
+
+
+def load_worker(base_url: str, path: str, token: Optional[str], count: int) -> Tuple[list, int]:
+    """Send `count` sequential requests, return (latencies of successes in seconds, failures)"""
+    latencies = []
+    errors = 0
+    with requests.Session() as http:
+        if token:
+            http.headers["Authorization"] = f"Bearer {token}"
+        for _ in range(count):
+            started = time.perf_counter()
+            try:
+                response = http.get(f"{base_url}{path}", timeout=60)
+                response.raise_for_status()
+            except requests.RequestException:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+    return latencies, errors
+
+
+def load_table(base_url: str, path: str, token: Optional[str], concurrency_levels,
+               requests_per_client: int) -> None:
+    """Print req/s, p50/p99 latency and failed requests of one path at several concurrency levels"""
+    print(f"\nGET {path}")
+    print(f"  {'clients':>8}{'req/s':>10}{'p50, ms':>10}{'p99, ms':>10}{'errors':>8}")
+    for clients in concurrency_levels:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=clients) as pool:
+            results = list(pool.map(lambda _: load_worker(base_url, path, token, requests_per_client),
+                                    range(clients)))
+        elapsed = time.perf_counter() - started
+        latencies = sorted(latency for result, _ in results for latency in result)
+        errors = sum(errors for _, errors in results)
+        if not latencies:
+            print(f"  {clients:>8}{'-':>10}{'-':>10}{'-':>10}{errors:8}")
+            continue
+        p50 = latencies[len(latencies) // 2] * 1000
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+        print(f"  {clients:>8}{len(latencies) / elapsed:10.0f}{p50:10.1f}{p99:10.1f}{errors:8}")
+
+
+def bench_load(base_url: str, paths, concurrency_levels, requests_per_client: int) -> None:
+    """Measure throughput and latency of a running server at several concurrency levels"""
+    token = get_load_test_token(base_url)
+    for path in paths:
+        load_table(base_url, path, token, concurrency_levels, requests_per_client)
+
+
+def create_comparison_app():
+    """Read handlers of the API mounted twice, as def and as async def
+
+    /sync/... runs in the threadpool on the sync StudentManager, the way the
+    endpoints worked before they became coroutines; /async/... awaits the
+    AsyncStudentManager on the event loop. Both skip the cache and
+    authentication so only the database layer is compared. Served by
+    `sync-vs-async` through `uvicorn --factory`, the database comes from
+    BENCHMARK_DB_URL.
+    """
+    from fastapi import FastAPI
+
+    db_url = os.environ['BENCHMARK_DB_URL']
+    sync_manager = StudentManager(db_url)
+    async_manager = AsyncStudentManager(db_url)
+    app = FastAPI()
+
+    @app.get("/sync/students/faculty/{faculty}")
+    def sync_students_by_faculty(faculty: str):
+        return sync_manager.get_students_by_faculty(faculty)
+
+    @app.get("/async/students/faculty/{faculty}")
+    async def async_students_by_faculty(faculty: str):
+        return await async_manager.get_students_by_faculty(faculty)
+
+    @app.get("/sync/courses/unique")
+    def sync_unique_courses():
+        return sync_manager.get_unique_courses()
+
+    @app.get("/async/courses/unique")
+    async def async_unique_courses():
+        return await async_manager.get_unique_courses()
+
+    @app.get("/sync/students")
+    def sync_students_page(limit: int = 100):
+        return sync_manager.get_students_page(limit)
+
+    @app.get("/async/students")
+    async def async_students_page(limit: int = 100):
+        return await async_manager.get_students_page(limit)
+
+    return app
+
+
+def wait_for_server(base_url: str, process: subprocess.Popen, timeout: float = 30) -> None:
+    """Block until the server answers or fail if it exits"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"server exited with code {process.returncode}")
+        try:
+            requests.get(f"{base_url}/openapi.json", timeout=1)
+            return
+        except requests.ConnectionError:
+            time.sleep(0.2)
+    raise RuntimeError("server did not start in time")
+
+
+def bench_sync_vs_async(rows: int, paths, concurrency_levels, requests_per_client: int, port: int) -> None:
+    """Load test the same handlers as def and as async def on one uvicorn worker"""
+    with tempfile.TemporaryDirectory() as workdir:
+        csv_file = os.path.join(workdir, 'students.csv')
+        make_synthetic_csv(csv_file, rows)
+        db_url = f"sqlite:///{os.path.join(workdir, 'compare.db')}"
+        StudentManager(db_url).populate_from_csv(csv_file)
+
+        base_url = f"http://127.0.0.1:{port}"
+        process = subprocess.Popen(
+            [sys.executable, '-m', 'uvicorn', 'benchmark:create_comparison_app', '--factory',
+             '--port', str(port), '--log-level', 'warning'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            env={**os.environ, 'BENCHMARK_DB_URL': db_url}
+        )
+        try:
+            wait_for_server(base_url, process)
+            print(f"\n{rows} students, one uvicorn worker, no cache")
+            for path in paths:
+                for variant in ('sync', 'async'):
+                    load_table(base_url, f"/{variant}{path}", None, concurrency_levels, requests_per_client)
+        finally:
+            process.terminate()
+            process.wait()
+
+
+# ============================================================================
+# Cache payload codecs
+# ============================================================================
+
+def bench_cache_codecs(rows: int, repeat: int = 5) -> None:
+    """Compare stored size and (de)compression time of cached lists per codec"""
+    with tempfile.TemporaryDirectory() as workdir:
+        csv_file = os.path.join(workdir, 'students.csv')
+        make_synthetic_csv(csv_file, rows)
+        manager = temp_manager(workdir, 'codecs.db')
+        manager.populate_from_csv(csv_file)
+
+        payloads = {'all students': manager.get_all_students()}
+        for faculty in FACULTIES:
+            payloads[f'faculty {faculty}'] = manager.get_students_by_faculty(faculty)
+
+        for name, value in payloads.items():
+            entry = CacheManager.encode(value, STUDENT_LIST_ADAPTER)
+            print(f"\n{name}: {len(value)} rows, {len(entry.body)} bytes of JSON")
+            print(f"  {'codec':<10}{'stored, bytes':>15}{'ratio':>8}{'pack, ms':>10}{'unpack, ms':>12}")
+            for codec in CACHE_CODECS:
+                data = CacheManager.pack(entry, codec)
+                pack_ms = bench_query(CacheManager.pack, entry, codec, repeat=repeat)
+                unpack_ms = bench_query(CacheManager.unpack, data, repeat=repeat)
+                print(f"  {codec:<10}{len(data):15}{len(entry.body) / len(data):8.1f}{pack_ms:10.2f}{unpack_ms:12.2f}")
+
+
+# ============================================================================
+# Token verification
+# ============================================================================
+
+def two_step_verify(manager: AuthManager, token: str) -> Optional[dict]:
+    """Session row first, expiry checked in Python, then the user row, the way verify_token used to work"""
+    session = manager.Session()
+    try:
+        db_session = session.query(Session).filter((Session.token == token) & (Session.is_active == True)).first()
+        if not db_session or db_session.expires_at < datetime.utcnow():
+            return None
+        user = session.query(User).filter(User.id == db_session.user_id).first()
+        if not user or not user.is_active:
+            return None
+        return {'user_id': user.id, 'username': user.username,
+                'is_read_only': user.is_read_only, 'is_active': user.is_active}
+    finally:
+        session.close()
+
+
+def two_step_refresh_lookup(manager: AuthManager, refresh_token: str):
+    """Session by refresh token, then its user, the way refresh_token_user used to look them up"""
+    session = manager.Session()
+    try:
+        db_session = session.query(Session).filter(
+            (Session.refresh_token == refresh_token) & (Session.is_active == True)).first()
+        user = session.query(User).filter(User.id == db_session.user_id).first()
+        return db_session.token, user.id, user.username, user.is_read_only
+    finally:
+        session.close()
+
+
+def joined_refresh_lookup(manager: AuthManager, refresh_token: str):
+    """The single joined query refresh_token_user runs now"""
+    session = manager.Session()
+    try:
+        return session.execute(AuthManager.REFRESH_SESSION_QUERY, {
+            'refresh_token': refresh_token, 'refresh_horizon': datetime.utcnow() - REFRESH_TOKEN_LIFETIME
+        }).first()
+    finally:
+        session.close()
+
+
+def bench_verify_token(sessions: int, users: int, calls: int, repeat: int = 3) -> None:
+    """Compare per-call latency of the two-step and the joined session lookups
+
+    The token cache is disabled, every call goes to the database.
+    """
+    api.token_cache = TokenCache(ttl=0)
+    rnd = random.Random(42)
+    with tempfile.TemporaryDirectory() as workdir:
+        manager = AuthManager(f"sqlite:///{os.path.join(workdir, 'tokens.db')}")
+        now = datetime.utcnow()
+        with manager.engine.begin() as conn:
+            conn.execute(User.__table__.insert(), [
+                {'username': f"user{i}", 'email': f"user{i}@example.com", 'password_hash': "-",
+                 'is_read_only': False, 'is_active': True, 'created_at': now}
+                for i in range(users)
+            ])
+            conn.execute(Session.__table__.insert(), [
+                {'user_id': rnd.randint(1, users), 'token': f"access{i}", 'refresh_token': f"refresh{i}",
+                 'created_at': now, 'expires_at': now + ACCESS_TOKEN_LIFETIME, 'is_active': i % 4 != 0}
+                for i in range(sessions)
+            ])
+        picks = [i for i in (rnd.randrange(sessions) for _ in range(calls * 4)) if i % 4][:calls]
+
+        print(f"\nSession lookups, {sessions} sessions of {users} users, {len(picks)} calls each")
+        print(f"  {'lookup':<34}{'µs/call':>10}")
+        cases = [
+            ('verify_token, two queries', two_step_verify, "access"),
+            ('verify_token, joined', lambda m, t: m.verify_token(t), "access"),
+            ('refresh lookup, two queries', two_step_refresh_lookup, "refresh"),
+            ('refresh lookup, joined', joined_refresh_lookup, "refresh"),
+        ]
+        for name, func, prefix in cases:
+            func(manager, f"{prefix}{picks[0]}")  # warm up the pool and statement caches
+            elapsed = min(timed(lambda: [func(manager, f"{prefix}{i}") for i in picks])[1] for _ in range(repeat))
+            print(f"  {name:<34}{elapsed / len(picks) * 1e6:10.1f}")
+
+
+# ============================================================================
+# Login throughput
+# ============================================================================
+
+async def login_client(manager: AsyncAuthManager, count: int, latencies: list) -> int:
+    """Log in `count` times in a row, return the number of rejected (429) attempts"""
+    rejected = 0
+    for _ in range(count):
+        started = time.perf_counter()
+        try:
+            if not await manager.login_user("bench_user", "bench_password"):
+                raise RuntimeError("login failed")
+            latencies.append(time.perf_counter() - started)
+        except PasswordHashingBusy:
+            rejected += 1
+    return rejected
+
+
+async def run_logins(manager: AsyncAuthManager, clients: int, count: int) -> Tuple[list, int, float]:
+    """Run concurrent login clients, return (latencies, rejected, elapsed seconds)"""
+    latencies = []
+    started = time.perf_counter()
+    rejected = await asyncio.gather(*(login_client(manager, count, latencies) for _ in range(clients)))
+    return sorted(latencies), sum(rejected), time.perf_counter() - started
+
+
+async def bench_login_async(db_url: str, costs, concurrency_levels, logins_per_client: int) -> None:
+    """Run every login round on one event loop"""
+    AuthManager(db_url)  # creates the schema
+    manager = AsyncAuthManager(db_url)
+    await manager.register_user("bench_user", "bench_user@example.com", "bench_password")
+    for cost in costs:
+        api.PASSWORD_KDF_COST = cost
+        hash_ms = bench_query(AuthManager.hash_password, "bench_password", repeat=3)
+        async with manager.Session() as session:
+            await session.execute(text("UPDATE users SET password_hash = :hash WHERE username = 'bench_user'"),
+                                  {'hash': AuthManager.hash_password("bench_password")})
+            await session.commit()
+        print(f"\n{api.PASSWORD_KDF}, cost {cost}: {hash_ms:.1f} ms per hash, {api.password_hasher.workers} "
+              f"hashing thread(s), queue limit {api.password_hasher.queue_limit}")
+        print(f"  {'clients':>8}{'logins/s':>10}{'p50, ms':>10}{'p99, ms':>10}{'429s':>8}")
+        for clients in concurrency_levels:
+            latencies, rejected, elapsed = await run_logins(manager, clients, logins_per_client)
+            if not latencies:
+                print(f"  {clients:>8}{0:10.0f}{'-':>10}{'-':>10}{rejected:8}")
+                continue
+            p50 = latencies[len(latencies) // 2] * 1000
+            p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+            print(f"  {clients:>8}{len(latencies) / elapsed:10.0f}{p50:10.1f}{p99:10.1f}{rejected:8}")
+    await manager.engine.dispose()
+
+
+def bench_login(kdf: str, costs, concurrency_levels, logins_per_client: int,
+                workers: int, queue_limit: int) -> None:
+    """Measure login throughput through the hashing pool at several KDF costs
+
+    Logins go through AsyncAuthManager on a temporary database, so the numbers
+    include the session insert but no HTTP overhead.
+    """
+    api.PASSWORD_KDF, api.PASSWORD_KDF_COST = kdf, costs[0]
+    api.password_hasher = PasswordHasher(workers, queue_limit)
+    with tempfile.TemporaryDirectory() as workdir:
+        db_url = f"sqlite:///{os.path.join(workdir, 'login.db')}"
+        asyncio.run(bench_login_async(db_url, costs, concurrency_levels, logins_per_client))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Students API benchmarks")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    csv_parser = subparsers.add_parser('csv-import', help="CSV import throughput")
+    csv_parser.add_argument('--rows', type=int, nargs='+', default=[100000])
+    csv_parser.add_argument('--skip-orm', action='store_true',
+                            help="do not run the slow row-by-row ORM import")
+    csv_parser.add_argument('--workers', type=int, nargs='+',
+                            help=f"parser process counts to compare (default: 1 {IMPORT_WORKERS})")
+
+    indexes_parser = subparsers.add_parser('indexes', help="query times without/with secondary indexes")
+    indexes_parser.add_argument('--rows', type=int, nargs='+', default=[1000000])
+    indexes_parser.add_argument('--repeat', type=int, default=5)
+
+    load_parser = subparsers.add_parser('load-test', help="concurrent HTTP load against a running server")
+    load_parser.add_argument('--url', default="http://localhost:8000")
+    load_parser.add_argument('--paths', nargs='+',
+                             default=["/students/faculty/АВТФ", "/courses/unique", "/students?limit=100"])
+    load_parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32, 64])
+    load_parser.add_argument('--requests', type=int, default=50, help="requests per client")
+
+    compare_parser = subparsers.add_parser('sync-vs-async',
+                                           help="the same handlers as def and as async def under load")
+    compare_parser.add_argument('--rows', type=int, default=20000)
+    compare_parser.add_argument('--paths', nargs='+',
+                                default=["/students/faculty/АВТФ", "/courses/unique", "/students?limit=100"])
+    compare_parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32, 64])
+    compare_parser.add_argument('--requests', type=int, default=50, help="requests per client")
+    compare_parser.add_argument('--port', type=int, default=8001)
+
+    codecs_parser = subparsers.add_parser('cache-codecs', help="cached payload size per codec")
+    codecs_parser.add_argument('--rows', type=int, default=100000)
+    codecs_parser.add_argument('--repeat', type=int, default=5)
+
+    verify_parser = subparsers.add_parser('verify-token', help="per-call latency of session lookups")
+    verify_parser.add_argument('--sessions', type=int, default=100000)
+    verify_parser.add_argument('--users', type=int, default=1000)
+    verify_parser.add_argument('--calls', type=int, default=5000)
+    verify_parser.add_argument('--repeat', type=int, default=3)
+
+    login_parser = subparsers.add_parser('login', help="login throughput at a given KDF cost")
+    login_parser.add_argument('--kdf', choices=sorted(PASSWORD_KDF_DEFAULT_COSTS), default='pbkdf2_sha256')
+    login_parser.add_argument('--cost', type=int, nargs='+',
+                              help="PBKDF2 iterations or scrypt N (default: the KDF's default cost)")
+    login_parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32])
+    login_parser.add_argument('--logins', type=int, default=20, help="logins per client")
+    login_parser.add_argument('--workers', type=int, default=PASSWORD_HASH_WORKERS, help="hashing threads")
+    login_parser.add_argument('--queue-limit', type=int, default=PASSWORD_HASH_QUEUE_LIMIT)
+
+    args = parser.parse_args()
+    if args.command == 'csv-import':
+        bench_csv_import(args.rows, args.skip_orm, args.workers)
+    elif args.command == 'indexes':
+        bench_indexes(args.rows, args.repeat)
+    elif args.command == 'load-test':
+        bench_load(args.url.rstrip('/'), args.paths, args.concurrency, args.requests)
+    elif args.command == 'sync-vs-async':
+        bench_sync_vs_async(args.rows, args.paths, args.concurrency, args.requests, args.port)
+    elif args.command == 'cache-codecs':
+        bench_cache_codecs(args.rows, args.repeat)
+    elif args.command == 'verify-token':
+        bench_verify_token(args.sessions, args.users, args.calls, args.repeat)
+    elif args.command == 'login':
+        bench_login(args.kdf, args.cost or [PASSWORD_KDF_DEFAULT_COSTS[args.kdf]], args.concurrency,
+                    args.logins, args.workers, args.queue_limit)
+
+
+if __name__ == "__main__":
+    main()
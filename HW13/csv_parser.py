@@ -0,0 +1,132 @@
+"""
+CSV parsing for the student import.
+
+Import workers run in separate processes that import only this module, so it
+must stay free of side effects: no database, Redis or configuration access at
+import time, and nothing beyond the standard library.
+"""
+
+import csv
+import hashlib
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Tuple
+
+# students table columns and the CSV header fields they are read from
+STUDENT_CSV_FIELDS = (
+    ('last_name', 'Фамилия'),
+    ('first_name', 'Имя'),
+    ('faculty', 'Факультет'),
+    ('course', 'Курс'),
+    ('score', 'Оценка'),
+)
+STUDENT_COLUMNS = tuple(column for column, _ in STUDENT_CSV_FIELDS)
+
+# A parsed row in STUDENT_COLUMNS order. Tuples cross the process boundary
+# at about half the unpickling cost of dicts and go to executemany as they are.
+StudentValues = Tuple[str, str, str, str, int]
+
+DEFAULT_RANGE_BYTES = 4 * 1024 * 1024
+
+
+def read_csv_header(f) -> List[str]:
+    """Read the header line of a CSV file opened in binary mode"""
+    return next(csv.reader([f.readline().decode('utf-8')]))
+
+
+def header_positions(header: List[str]) -> Tuple[int, ...]:
+    """Positions of the student fields in a CSV header"""
+    return tuple(header.index(field) for _, field in STUDENT_CSV_FIELDS)
+
+
+def student_values(values: List[str], positions: Tuple[int, ...]) -> StudentValues:
+    """Convert the fields of one CSV record into a students table row"""
+    last_name, first_name, faculty, course, score = (values[i] for i in positions)
+    return last_name, first_name, faculty, course, int(score)
+
+
+def row_values(row: Dict) -> StudentValues:
+    """Convert a CSV row read as a dict into a students table row"""
+    last_name, first_name, faculty, course, score = (row[field] for _, field in STUDENT_CSV_FIELDS)
+    return last_name, first_name, faculty, course, int(score)
+
+
+def iter_csv_rows(csv_file: str, start_offset: int = 0) -> Iterator[Tuple[Dict, int]]:
+    """Stream CSV rows as (row, byte offset right after the row)
+
+    The file is read line by line in binary mode so the offset of every
+    record boundary is known and an import can later seek straight to it.
+    """
+    with open(csv_file, 'rb') as f:
+        header = read_csv_header(f)
+        if start_offset > f.tell():
+            f.seek(start_offset)
+        position = f.tell()
+
+        def lines():
+            nonlocal position
+            for line in iter(f.readline, b''):
+                position += len(line)
+                yield line.decode('utf-8')
+
+        # csv.reader pulls lines lazily, so `position` always points at the
+        # end of the record it has just returned
+        for values in csv.reader(lines()):
+            if values:
+                yield dict(zip(header, values)), position
+
+
+def split_csv_ranges(csv_file: str, start_offset: int = 0,
+                     range_bytes: int = DEFAULT_RANGE_BYTES) -> Tuple[List[str], List[Tuple[int, int]]]:
+    """Split the data part of a CSV file into byte ranges that end on line boundaries
+
+    Records are expected to fit on one line, which holds for registrar exports.
+    """
+    file_size = os.path.getsize(csv_file)
+    ranges = []
+    with open(csv_file, 'rb') as f:
+        header = read_csv_header(f)
+        start = max(start_offset, f.tell())
+        while start < file_size:
+            f.seek(min(start + range_bytes, file_size))
+            f.readline()
+            end = f.tell()
+            ranges.append((start, end))
+            start = end
+    return header, ranges
+
+
+def parse_csv_range(csv_file: str, header: List[str], start: int, end: int) -> List[StudentValues]:
+    """Parse and validate one byte range of a CSV file (runs in a worker process)"""
+    with open(csv_file, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start).decode('utf-8')
+    positions = header_positions(header)
+    return [student_values(values, positions) for values in csv.reader(io.StringIO(data)) if values]
+
+
+def csv_boundary_digest(csv_file: str, byte_offset: int, window: int = 256) -> str:
+    """Fingerprint of the bytes right before an offset, used to validate import checkpoints"""
+    with open(csv_file, 'rb') as f:
+        start = max(0, byte_offset - window)
+        f.seek(start)
+        data = f.read(byte_offset - start)
+    return hashlib.sha1(data).hexdigest()
+
+
+def parser_pool(workers: int) -> ProcessPoolExecutor:
+    """Process pool for parse_csv_range
+
+    The API calls this from a thread of a multi-threaded server, where fork
+    would copy locks held by other threads. Workers are forked from a
+    forkserver started from a fresh interpreter instead, with only this module
+    preloaded. Like every spawn or forkserver child, a worker still imports
+    the script the parent was started with as __mp_main__; under
+    `uvicorn main:app` that is the uvicorn launcher, which does nothing on
+    import, while `python main.py` would set up a second app in each worker.
+    """
+    context = multiprocessing.get_context('forkserver')
+    context.set_forkserver_preload([__name__])
+    return ProcessPoolExecutor(max_workers=workers, mp_context=context)
@@ -1,99 +1,1238 @@
+import asyncio
+import base64
 import csv
+import math
+import random
+import os
 import sys
 import hashlib
+import hmac
 import secrets
 import json
 import uuid
-from datetime import datetime, timedelta
-from sqlalchemy import create_engine, Column, Integer, String, func, Boolean, DateTime
+import time
+import threading
+import zlib
+from itertools import islice
+from collections import deque, OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import create_engine, event, Column, Integer, String, func, Boolean, DateTime, Index, update, delete, inspect, text, select, bindparam
 from sqlalchemy.orm import declarative_base, sessionmaker
-from typing import List, Dict, Optional, Tuple
-from fastapi import FastAPI, HTTPException, Depends, Header, BackgroundTasks
-from pydantic import BaseModel
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.engine import Engine, Connection
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncEngine
+from typing import Any, List, Dict, Optional, Tuple, Iterable, Iterator, AsyncIterator, Awaitable, Callable, NamedTuple
+from fastapi import FastAPI, HTTPException, Depends, Header, BackgroundTasks, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, TypeAdapter
 import redis
-from functools import wraps
+import redis.asyncio
+from functools import wraps, partial
+from contextlib import contextmanager
+from contextvars import ContextVar
+from csv_parser import (
+    DEFAULT_RANGE_BYTES, STUDENT_COLUMNS, StudentValues, csv_boundary_digest, iter_csv_rows,
+    parse_csv_range, parser_pool, row_values, split_csv_ranges
+)
+
+# Optional cache compression codecs
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+try:
+    import lz4.frame
+except ImportError:
+    lz4 = None
 
 if sys.stdout.encoding != 'utf-8':
     sys.stdout.reconfigure(encoding='utf-8')
 
-engine = create_engine('sqlite:///students.db')
 Base = declarative_base()
 app = FastAPI(title="Students API with Authentication & Background Tasks")
 
-# Redis cache configuration
+# Redis cache configuration. The sync client (CLI, background tasks, pub/sub)
+# and the asyncio client (async endpoints) have their own bounded pools;
+# callers wait up to REDIS_POOL_TIMEOUT for a free connection. Replies are
+# bytes: cached payloads are binary (possibly compressed).
+REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+REDIS_POOL_CONFIG = {
+    'max_connections': int(os.getenv('REDIS_MAX_CONNECTIONS', 50)),
+    'timeout': float(os.getenv('REDIS_POOL_TIMEOUT', 5)),
+    'socket_timeout': float(os.getenv('REDIS_SOCKET_TIMEOUT', 2)),
+    'socket_connect_timeout': float(os.getenv('REDIS_CONNECT_TIMEOUT', 2)),
+    'health_check_interval': 30,
+}
+redis_client = redis.Redis(connection_pool=redis.BlockingConnectionPool.from_url(REDIS_URL, **REDIS_POOL_CONFIG))
+async_redis_client = redis.asyncio.Redis(
+    connection_pool=redis.asyncio.BlockingConnectionPool.from_url(REDIS_URL, **REDIS_POOL_CONFIG)
+)
 try:
-    redis_client = redis.Redis(host='localhost', port=6379, db=0, decode_responses=True)
     redis_client.ping()
     REDIS_AVAILABLE = True
-except (redis.ConnectionError, ConnectionRefusedError):
+except (redis.ConnectionError, redis.TimeoutError, ConnectionRefusedError):
     REDIS_AVAILABLE = False
-    redis_client = None
     print("⚠️  Redis not available. Caching disabled.")
 
 
+# Database configuration, shared by all managers through get_engine()
+DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite:///students.db')
+DB_POOL_CONFIG = {
+    'pool_size': int(os.getenv('DB_POOL_SIZE', '5')),
+    'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', '10')),
+    'pool_timeout': int(os.getenv('DB_POOL_TIMEOUT', '30')),
+    'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', '3600')),  # seconds, -1 disables
+}
+# Pre-ping costs a SELECT 1 per checkout. Server connections can go stale,
+# local SQLite files cannot, so it is off for SQLite unless set explicitly.
+DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING')
+
+
+def pool_config(db_url: str) -> Dict:
+    """Pool settings of DB_POOL_CONFIG plus pre-ping as configured for the URL"""
+    if DB_POOL_PRE_PING is not None:
+        pre_ping = DB_POOL_PRE_PING == '1'
+    else:
+        pre_ping = not db_url.startswith('sqlite')
+    return {**DB_POOL_CONFIG, 'pool_pre_ping': pre_ping}
+
+
+# SQLite PRAGMA profiles applied to every new connection. WAL lets readers
+# keep working while a writer (e.g. a CSV import) holds the write lock.
+# Profiles set the same keys, so switching back restores every setting.
+SQLITE_PRAGMA_PROFILES = {
+    'durable': {
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'cache_size': -64000,  # negative value is KiB, ~64 MB
+        'mmap_size': 256 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,  # ms
+        'wal_autocheckpoint': 1000,  # pages, the SQLite default
+    },
+    # Bulk imports: fewer fsyncs (still crash-safe in WAL mode), bigger cache
+    # and rarer checkpoints; the last transactions may be lost on power loss
+    'bulk-load': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -256000,
+        'mmap_size': 1024 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 30000,
+        'wal_autocheckpoint': 10000,
+    },
+}
+SQLITE_PROFILE = os.getenv('SQLITE_PROFILE', 'durable')
+if SQLITE_PROFILE not in SQLITE_PRAGMA_PROFILES:
+    raise RuntimeError(f"Unknown SQLITE_PROFILE {SQLITE_PROFILE!r}, "
+                       f"expected one of: {', '.join(SQLITE_PRAGMA_PROFILES)}")
+
+# Verified access tokens are cached in-process. Logout, refresh and user
+# deactivation evict entries in every worker: evictions are broadcast over
+# Redis pub/sub as token digests, never as the tokens themselves.
+TOKEN_CACHE_SIZE = 10000
+TOKEN_CACHE_TTL = 30
+TOKEN_CACHE_INVALIDATION_CHANNEL = "auth:token-cache:invalidate"
+
+# Access tokens are "opaque" (random, looked up in the sessions table) or
+# "signed": HMAC-SHA256 signed claims verified without the database. Revoked
+# signed tokens are kept in Redis until they expire and in memory of every
+# worker. All workers must share AUTH_TOKEN_SECRET.
+ACCESS_TOKEN_LIFETIME = timedelta(hours=24)
+# A session can be refreshed until REFRESH_TOKEN_LIFETIME after its access
+# token expired; the session sweeper keeps it that long
+REFRESH_TOKEN_LIFETIME = timedelta(days=30)
+AUTH_TOKEN_MODE = os.getenv('AUTH_TOKEN_MODE', 'opaque')
+AUTH_TOKEN_SECRET = os.getenv('AUTH_TOKEN_SECRET', '').encode()
+if AUTH_TOKEN_MODE == 'signed' and not AUTH_TOKEN_SECRET:
+    # A per-process secret would reject tokens signed by other workers or
+    # before a restart
+    raise RuntimeError("AUTH_TOKEN_MODE=signed requires AUTH_TOKEN_SECRET shared by all workers")
+if AUTH_TOKEN_MODE == 'signed' and not REDIS_AVAILABLE:
+    # Without Redis a revocation reaches only the worker that made it, the
+    # other workers would accept the token until it expires
+    raise RuntimeError("AUTH_TOKEN_MODE=signed requires Redis to share token revocations")
+TOKEN_REVOCATION_CHANNEL = "auth:revoke"
+
+# Sessions past their refresh window and logged out sessions are deleted by
+# a background sweeper, in batches of SESSION_SWEEP_BATCH rows with a short
+# transaction each, so API writes never wait long for the SQLite write lock.
+# With Redis, one worker sweeps per interval.
+SESSION_SWEEP_INTERVAL = float(os.getenv('SESSION_SWEEP_INTERVAL', 600))
+SESSION_SWEEP_BATCH = 500
+SESSION_SWEEP_PAUSE = 0.01  # seconds between batches
+
+# Passwords are hashed with a slow KDF ("pbkdf2_sha256" or "scrypt") in a
+# dedicated thread pool, off the event loop. The KDF and its cost are stored
+# with every hash, so raising the cost only rehashes users on their next login.
+# When more than PASSWORD_HASH_QUEUE_LIMIT hashes are queued or running,
+# register and login answer 429 instead of queueing without bound.
+PASSWORD_KDF = os.getenv('PASSWORD_KDF', 'pbkdf2_sha256')
+PASSWORD_KDF_DEFAULT_COSTS = {'pbkdf2_sha256': 200000, 'scrypt': 2 ** 14}  # iterations / scrypt N
+if PASSWORD_KDF not in PASSWORD_KDF_DEFAULT_COSTS:
+    raise RuntimeError(f"Unsupported PASSWORD_KDF {PASSWORD_KDF!r}, "
+                       f"expected one of: {', '.join(PASSWORD_KDF_DEFAULT_COSTS)}")
+PASSWORD_KDF_COST = int(os.getenv('PASSWORD_KDF_COST', PASSWORD_KDF_DEFAULT_COSTS[PASSWORD_KDF]))
+if PASSWORD_KDF == 'scrypt' and (PASSWORD_KDF_COST < 2 or PASSWORD_KDF_COST & (PASSWORD_KDF_COST - 1)):
+    raise RuntimeError(f"PASSWORD_KDF_COST for scrypt must be a power of 2, got {PASSWORD_KDF_COST}")
+PASSWORD_SCRYPT_R = 8
+PASSWORD_SCRYPT_P = 1
+PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', os.cpu_count() or 1))
+PASSWORD_HASH_QUEUE_LIMIT = int(os.getenv('PASSWORD_HASH_QUEUE_LIMIT', 4 * PASSWORD_HASH_WORKERS))
+
+# Login and register attempts are limited per username and per client IP with
+# sliding window counters: the count of the current fixed window plus the
+# previous one weighted by how much of it still overlaps the sliding window.
+# With Redis the counters are shared by all workers, otherwise each worker
+# counts on its own. Throttled requests get 429 before any database or
+# hashing work.
+LOGIN_RATE_LIMIT_WINDOW = int(os.getenv('LOGIN_RATE_LIMIT_WINDOW', 60))  # seconds
+LOGIN_RATE_LIMIT_PER_USERNAME = int(os.getenv('LOGIN_RATE_LIMIT_PER_USERNAME', 10))
+LOGIN_RATE_LIMIT_PER_IP = int(os.getenv('LOGIN_RATE_LIMIT_PER_IP', 60))
+RATE_LIMIT_MAX_KEYS = 100000  # in-memory counters kept per worker
+
+# In-process L1 cache in front of Redis. Entries live for a few seconds at
+# most; invalidations are broadcast to all workers over Redis pub/sub.
+L1_CACHE_MAX_BYTES = 32 * 1024 * 1024
+L1_CACHE_TTL = 5
+CACHE_INVALIDATION_CHANNEL = "cache:invalidate"
+
+# Cache misses are computed once per key: concurrent callers in a worker wait
+# for the same task, other workers wait for a Redis lock. The holder extends
+# the lock while it computes, so slow queries never let it lapse mid-compute;
+# a holder that died leaves the lock for at most CACHE_LOCK_TTL seconds. With
+# early refresh, hits are refreshed with rising probability shortly before
+# the soft TTL.
+CACHE_LOCK_TTL = 10  # seconds the lock outlives its last renewal
+CACHE_LOCK_POLL_INTERVAL = 0.05  # first wait between polls, doubled up to 0.5 s
+CACHE_LOCK_MAX_WAIT = float(os.getenv('CACHE_LOCK_MAX_WAIT', 300))  # then waiters compute themselves
+CACHE_EARLY_REFRESH = os.getenv('CACHE_EARLY_REFRESH', '0') == '1'
+CACHE_EARLY_REFRESH_BETA = 1.0
+
+# Cached response bodies of at least CACHE_COMPRESS_MIN_BYTES are compressed
+# with CACHE_CODEC before they go to Redis; L1 keeps them uncompressed.
+# Codecs: name -> (compress, decompress)
+CACHE_CODECS = {
+    "identity": (bytes, bytes),
+    "zlib": (lambda data: zlib.compress(data, 6), zlib.decompress),
+}
+if lz4 is not None:
+    CACHE_CODECS["lz4"] = (lz4.frame.compress, lz4.frame.decompress)
+if zstandard is not None:
+    CACHE_CODECS["zstd"] = (lambda data: zstandard.compress(data, 3), zstandard.decompress)
+CACHE_CODEC = os.getenv('CACHE_CODEC', "zstd" if zstandard is not None else "zlib")
+if CACHE_CODEC not in CACHE_CODECS:
+    print(f"⚠️  Cache codec {CACHE_CODEC} not available, using zlib.")
+    CACHE_CODEC = "zlib"
+CACHE_COMPRESS_MIN_BYTES = int(os.getenv('CACHE_COMPRESS_MIN_BYTES', 1024))
+
+# Cache warming: hot keys are precomputed in the background on startup and
+# after bulk jobs, at most CACHE_WARM_RATE keys per second. The warmer keeps
+# its share of database time under CACHE_WARM_DB_SHARE and waits while the
+# endpoints hold half of the async connection pool or more.
+CACHE_WARM_ON_STARTUP = os.getenv('CACHE_WARM_ON_STARTUP', '1') == '1'
+CACHE_WARM_RATE = float(os.getenv('CACHE_WARM_RATE', 20))
+CACHE_WARM_DB_SHARE = 0.25
+CACHE_WARM_THRESHOLDS = (30,)  # low-score thresholds to warm, 30 is the endpoint default
+
+# Lookups of missing students are cached for NEGATIVE_CACHE_TTL seconds.
+# Every worker also keeps a Bloom filter of existing student IDs, rebuilt
+# after bulk jobs, to answer most misses without Redis or the database.
+NEGATIVE_CACHE_TTL = 30
+STUDENT_BLOOM_ERROR_RATE = 0.01
+
+# Pagination settings for GET /students
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+STREAM_BATCH_SIZE = 1000  # rows fetched from the cursor / sent per NDJSON chunk
+
+# Bulk import settings
+IMPORT_CHUNK_SIZE = 10000  # rows per executemany INSERT / transaction
+IMPORT_WORKERS = os.cpu_count() or 1  # parser processes for large CSV files
+PARALLEL_IMPORT_MIN_BYTES = 32 * 1024 * 1024  # smaller files are parsed in-process
+IMPORT_RANGE_BYTES = DEFAULT_RANGE_BYTES  # byte range parsed by one worker / committed at once
+IMPORT_LOCK_STALE_SECONDS = 300  # a lock not renewed for this long belongs to a crashed import
+
+
+class LocalCache:
+    """In-process LRU cache bounded by the total size of its entries in bytes"""
+
+    def __init__(self, max_bytes: int = L1_CACHE_MAX_BYTES, ttl: float = L1_CACHE_TTL):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()  # key -> (expires at, size, value)
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        """Get value, None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def set(self, key: str, value, size: int) -> None:
+        """Store value, evicting least recently used entries to stay within max_bytes"""
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, size, value)
+            self.size += size
+            while self.size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def delete(self, *keys: str) -> None:
+        """Drop entries"""
+        with self._lock:
+            for key in keys:
+                if key in self._entries:
+                    self._remove(key)
+
+    def _remove(self, key: str) -> None:
+        _, size, _ = self._entries.pop(key)
+        self.size -= size
+
+    def stats(self) -> Dict:
+        """Cache size and hit statistics"""
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self.size, 'max_bytes': self.max_bytes,
+                    'ttl': self.ttl, 'hits': self.hits, 'misses': self.misses}
+
+
+local_cache = LocalCache()
+
+
+class BloomFilter:
+    """Set of integers with false positives but no false negatives, in a fixed number of bits"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(capacity, 1)
+        self.size = max(64, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self._lock = threading.Lock()
+
+    def _positions(self, item: int) -> List[int]:
+        # splitmix64 of the item, then double hashing
+        x = (item + 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+        x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & 0xFFFFFFFFFFFFFFFF
+        x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & 0xFFFFFFFFFFFFFFFF
+        x ^= x >> 31
+        h1, h2 = x & 0xFFFFFFFF, (x >> 32) | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, item: int) -> None:
+        """Add item"""
+        positions = self._positions(item)
+        with self._lock:
+            for position in positions:
+                self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: int) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class CacheEntry(NamedTuple):
+    """Cached response: the encoded JSON body with its content hash"""
+    body: bytes
+    etag: str
+    headers: Dict[str, str]
+    compute_time: float
+    fresh_until: float
+
+    def to_response(self) -> Response:
+        """Build a raw response, bypassing response_model validation and encoding"""
+        return Response(content=self.body, media_type="application/json",
+                        headers={"ETag": f'"{self.etag}"', **self.headers})
+
+
 # Cache management utilities
 class CacheManager:
     """Manage Redis caching for API responses"""
 
     CACHE_TTL = 3600  # 1 hour cache TTL in seconds
+    # Per-endpoint (soft TTL, hard TTL) in seconds. Past the soft TTL the
+    # stale value is still served and refreshed by a background task, past
+    # the hard TTL the entry is gone and the next request computes it.
+    CACHE_POLICIES = {
+        "students:page": (60, CACHE_TTL),
+        "students:by_id": (300, CACHE_TTL),
+        "students:by_faculty": (300, CACHE_TTL),
+        "students:low_scores": (300, CACHE_TTL),
+        "faculty:avg_score": (300, CACHE_TTL),
+        "courses:unique": (600, CACHE_TTL),
+    }
+    # Bump the version when the cached payload format changes, old entries
+    # are then simply never read again and expire by TTL
+    KEY_PREFIX = "cache:v4"
+
+    # Every namespace has a generation counter in Redis. Keys embed the
+    # generations they depend on, so invalidation is a single INCR and the
+    # entries of older generations are never read again and expire by TTL.
+    # Namespaces are fine-grained: "faculty:<name>", "course:<name>",
+    # "student:<id>", "students:list" (pages) and "courses" (unique list);
+    # every entry also depends on "students", bumped by bulk jobs.
+    GENERATION_PREFIX = "cache:gen"
+    GLOBAL_NAMESPACE = "students"
+    # Body of a cached "not found" result
+    MISSING_BODY = b'null'
+    # Called with the invalidated namespaces, by any worker
+    invalidation_hooks: List[Callable[[List[str]], None]] = []
+
+    # Both cached values and namespace generations are kept in the L1
+    # local_cache; generations are dropped there when an invalidation
+    # message arrives, so all workers switch to the new keys at once
+    _pubsub_thread = None
+    _json_adapter = TypeAdapter(Any)
+    _codec_stats = {"writes": 0, "raw_bytes": 0, "stored_bytes": 0}
 
     @staticmethod
-    def make_cache_key(endpoint: str, params: dict = None) -> str:
-        """Generate cache key from endpoint and parameters"""
+    def build_key(endpoint: str, params: Optional[dict], generations: Iterable[int]) -> str:
+        """Build cache key from endpoint, parameters and the generations of its namespaces"""
+        key = f"{CacheManager.KEY_PREFIX}:{endpoint}"
+        if generations:
+            key += ":g" + ".".join(str(generation) for generation in generations)
         if params:
-            param_str = json.dumps(params, sort_keys=True, default=str)
-            return f"cache:{endpoint}:{hash(param_str)}"
-        return f"cache:{endpoint}"
+            param_str = json.dumps(params, sort_keys=True, default=str, separators=(',', ':'))
+            digest = hashlib.blake2b(param_str.encode(), digest_size=16).hexdigest()
+            key += f":{digest}"
+        return key
+
+    @staticmethod
+    def generation_keys(namespaces: Iterable[str]) -> List[str]:
+        """Redis keys of the generation counters of namespaces"""
+        return [f"{CacheManager.GENERATION_PREFIX}:{ns}" for ns in namespaces]
+
+    @staticmethod
+    def cached_generations(keys: List[str]) -> Tuple[List[Optional[int]], List[str]]:
+        """Generations found in the L1 cache and the keys missing there"""
+        generations = [local_cache.get(key) for key in keys]
+        return generations, [key for key, generation in zip(keys, generations) if generation is None]
+
+    @staticmethod
+    def merge_generations(keys: List[str], generations: List[Optional[int]], missing: List[str],
+                          values: List[Optional[bytes]]) -> List[int]:
+        """Fill in generations fetched from Redis and keep them in the L1 cache"""
+        fetched = {key: int(value) if value else 0 for key, value in zip(missing, values)}
+        for key, generation in fetched.items():
+            local_cache.set(key, generation, len(key))
+        return [fetched.get(key, generation) for key, generation in zip(keys, generations)]
+
+    @staticmethod
+    def student_namespaces(*students: Optional[Dict], courses_changed: bool = True) -> List[str]:
+        """Namespaces affected by a write, given old and/or new versions of the row"""
+        namespaces = {"students:list"}
+        for student in students:
+            if student:
+                namespaces.update({
+                    f"student:{student['id']}",
+                    f"faculty:{student['faculty']}",
+                    f"course:{student['course']}"
+                })
+        if courses_changed:
+            namespaces.add("courses")
+        return sorted(namespaces)
+
+    @staticmethod
+    def queue_invalidation(pipe, keys: List[str]) -> None:
+        """Queue generation bumps and their broadcast on a sync or async pipeline"""
+        for key in keys:
+            pipe.incr(key)
+        pipe.publish(CACHE_INVALIDATION_CHANNEL, json.dumps(keys))
+
+    @staticmethod
+    def invalidate(*namespaces: str) -> bool:
+        """Invalidate all entries of the namespaces by bumping their generations
+
+        Used by the background jobs, which run in the threadpool; request
+        handlers call AsyncCacheManager.invalidate.
+        """
+        CacheManager.run_invalidation_hooks(namespaces)
+        if not REDIS_AVAILABLE:
+            return False
+        keys = CacheManager.generation_keys(namespaces)
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            CacheManager.queue_invalidation(pipe, keys)
+            pipe.execute()
+            return True
+        except Exception as e:
+            print(f"Cache invalidate error: {e}")
+        finally:
+            local_cache.delete(*keys)
+        return False
+
+    @staticmethod
+    def run_invalidation_hooks(namespaces: Iterable[str]) -> None:
+        """Tell in-process consumers which namespaces were invalidated"""
+        namespaces = list(namespaces)
+        for hook in CacheManager.invalidation_hooks:
+            try:
+                hook(namespaces)
+            except Exception as e:
+                print(f"Cache invalidation hook error: {e}")
+
+    @staticmethod
+    def _on_invalidation_message(message: Dict) -> None:
+        """Drop generations invalidated by any worker from the L1 cache"""
+        try:
+            keys = json.loads(message['data'])
+            local_cache.delete(*keys)
+            CacheManager.run_invalidation_hooks(key[len(CacheManager.GENERATION_PREFIX) + 1:] for key in keys)
+        except (ValueError, TypeError) as e:
+            print(f"Cache invalidation message error: {e}")
+
+    @staticmethod
+    def start_invalidation_listener() -> None:
+        """Subscribe this worker to invalidation messages of the other workers"""
+        if not REDIS_AVAILABLE or CacheManager._pubsub_thread is not None:
+            return
+        pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{CACHE_INVALIDATION_CHANNEL: CacheManager._on_invalidation_message})
+        CacheManager._pubsub_thread = pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+
+    @staticmethod
+    def stop_invalidation_listener() -> None:
+        """Stop the invalidation subscriber thread"""
+        if CacheManager._pubsub_thread is not None:
+            CacheManager._pubsub_thread.stop()
+            CacheManager._pubsub_thread = None
+
+    @staticmethod
+    def encode(value: Any, adapter: Optional[TypeAdapter] = None, headers: Optional[Dict[str, str]] = None,
+               compute_time: float = 0.0, fresh_for: float = CACHE_TTL) -> CacheEntry:
+        """Validate and encode value once, the way the endpoint response would be"""
+        adapter = adapter or CacheManager._json_adapter
+        body = adapter.dump_json(adapter.validate_python(value))
+        etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+        return CacheEntry(body, etag, headers or {}, compute_time, time.time() + fresh_for)
+
+    @staticmethod
+    def pack(entry: CacheEntry, codec: str = CACHE_CODEC) -> bytes:
+        """Serialize entry for Redis: a JSON header line, then the body
+
+        The body is compressed with codec if it is large enough, so a hit
+        never parses it, at most decompresses it.
+        """
+        if len(entry.body) < CACHE_COMPRESS_MIN_BYTES:
+            codec = "identity"
+        header = json.dumps({'c': codec, 'h': entry.etag, 'x': entry.headers,
+                             'd': entry.compute_time, 'e': entry.fresh_until})
+        return header.encode() + b'\n' + CACHE_CODECS[codec][0](entry.body)
+
+    @staticmethod
+    def unpack(data: bytes) -> CacheEntry:
+        """Deserialize entry packed by pack()"""
+        header, body = data.split(b'\n', 1)
+        meta = json.loads(header)
+        return CacheEntry(CACHE_CODECS[meta['c']][1](body), meta['h'], meta['x'], meta['d'], meta['e'])
+
+    @staticmethod
+    def record_write(key: str, entry: CacheEntry, data: bytes) -> None:
+        """Keep a stored entry in L1 and count its sizes"""
+        local_cache.set(key, entry, len(entry.body))
+        CacheManager._codec_stats["writes"] += 1
+        CacheManager._codec_stats["raw_bytes"] += len(entry.body)
+        CacheManager._codec_stats["stored_bytes"] += len(data)
+
+    @staticmethod
+    def codec_stats() -> Dict:
+        """Size of the cached bodies before and after compression"""
+        stats = dict(CacheManager._codec_stats)
+        stats["ratio"] = round(stats["raw_bytes"] / stats["stored_bytes"], 2) if stats["stored_bytes"] else None
+        return {"codec": CACHE_CODEC, "compress_min_bytes": CACHE_COMPRESS_MIN_BYTES, **stats}
+
+    @staticmethod
+    def describe(key: str, data: bytes) -> Dict:
+        """Report codec, size in Redis and compression ratio of a packed entry"""
+        entry = CacheManager.unpack(data)
+        return {
+            "key": key,
+            "codec": json.loads(data.split(b'\n', 1)[0])['c'],
+            "raw_bytes": len(entry.body),
+            "stored_bytes": len(data),
+            "ratio": round(len(entry.body) / len(data), 2)
+        }
+
+    @staticmethod
+    def needs_refresh(compute_time: float, fresh_until: float) -> bool:
+        """Check if an entry is stale
+
+        With early refresh enabled the entry expires probabilistically: the
+        closer to its soft TTL and the slower the query, the likelier it is
+        treated as stale.
+        """
+        now = time.time()
+        if now >= fresh_until:
+            return True
+        if not CACHE_EARLY_REFRESH or compute_time <= 0:
+            return False
+        return now - compute_time * CACHE_EARLY_REFRESH_BETA * math.log(1.0 - random.random()) >= fresh_until
+
+
+class AsyncCacheManager:
+    """Cache access of the async endpoints, using the asyncio Redis client
+
+    Keys, entry format and namespaces are the ones of CacheManager.
+    """
+
+    _inflight: Dict[str, asyncio.Future] = {}
+    _background_tasks = set()
+    # Keys computed by the current task, collected when set to a list
+    computed_keys: ContextVar[Optional[List[str]]] = ContextVar('computed_keys', default=None)
+
+    @staticmethod
+    async def make_cache_key(endpoint: str, params: dict = None, namespaces: Tuple[str, ...] = ()) -> str:
+        """Generate cache key from endpoint, parameters and namespace generations
+
+        The digest is stable across processes and restarts (unlike hash(),
+        which is salted per process), so all workers share the same keys.
+        """
+        generations = ()
+        if namespaces:
+            generations = await AsyncCacheManager.get_generations((CacheManager.GLOBAL_NAMESPACE,) + tuple(namespaces))
+        return CacheManager.build_key(endpoint, params, generations)
+
+    @staticmethod
+    async def get_generations(namespaces: Tuple[str, ...]) -> List[int]:
+        """Get current generation of each namespace"""
+        if not REDIS_AVAILABLE:
+            return [0] * len(namespaces)
+        keys = CacheManager.generation_keys(namespaces)
+        generations, missing = CacheManager.cached_generations(keys)
+        if not missing:
+            return generations
+        try:
+            values = await async_redis_client.mget(missing)
+            return CacheManager.merge_generations(keys, generations, missing, values)
+        except Exception as e:
+            print(f"Cache generation error: {e}")
+        return [0] * len(namespaces)
+
+    @staticmethod
+    async def invalidate(*namespaces: str) -> bool:
+        """Invalidate all entries of the namespaces by bumping their generations"""
+        CacheManager.run_invalidation_hooks(namespaces)
+        if not REDIS_AVAILABLE:
+            return False
+        keys = CacheManager.generation_keys(namespaces)
+        try:
+            async with async_redis_client.pipeline(transaction=False) as pipe:
+                CacheManager.queue_invalidation(pipe, keys)
+                await pipe.execute()
+            return True
+        except Exception as e:
+            print(f"Cache invalidate error: {e}")
+        finally:
+            local_cache.delete(*keys)
+        return False
 
     @staticmethod
-    def get(key: str) -> Optional[List[Dict]]:
-        """Get value from cache"""
+    async def get_entry(key: str) -> Optional[CacheEntry]:
+        """Get entry from L1 cache, then from Redis"""
         if not REDIS_AVAILABLE:
             return None
+        entry = local_cache.get(key)
+        if entry is not None:
+            return entry
         try:
-            data = redis_client.get(key)
+            data = await async_redis_client.get(key)
             if data:
-                return json.loads(data)
+                entry = CacheManager.unpack(data)
+                local_cache.set(key, entry, len(entry.body))
+                return entry
         except Exception as e:
             print(f"Cache get error: {e}")
         return None
 
     @staticmethod
-    def set(key: str, value: List[Dict], ttl: int = CACHE_TTL) -> bool:
-        """Set value in cache"""
+    async def store(key: str, entry: CacheEntry, ttl: int = CacheManager.CACHE_TTL) -> bool:
+        """Store encoded entry in Redis and L1 cache for ttl seconds"""
         if not REDIS_AVAILABLE:
             return False
         try:
-            redis_client.setex(key, ttl, json.dumps(value, default=str))
+            data = CacheManager.pack(entry)
+            await async_redis_client.setex(key, ttl, data)
+            CacheManager.record_write(key, entry, data)
             return True
         except Exception as e:
             print(f"Cache set error: {e}")
         return False
 
     @staticmethod
-    def delete(key: str) -> bool:
-        """Delete value from cache"""
+    async def describe(key: str) -> Optional[Dict]:
+        """Describe the entry stored in Redis under key, None if there is none"""
         if not REDIS_AVAILABLE:
-            return False
+            return None
+        data = await async_redis_client.get(key)
+        return CacheManager.describe(key, data) if data is not None else None
+
+    @staticmethod
+    async def get_or_compute(key: str, compute: Callable[[], Awaitable[Any]], policy: Optional[str] = None,
+                             adapter: Optional[TypeAdapter] = None,
+                             headers: Optional[Callable[[Any], Dict[str, str]]] = None,
+                             cache_missing: bool = False) -> Optional[CacheEntry]:
+        """Get entry from cache or compute it, coalescing concurrent misses of a key
+
+        policy names an entry of CACHE_POLICIES. The computed value is
+        validated and encoded with adapter, headers builds extra response
+        headers from it. A stale entry is returned at once and refreshed in
+        the background. A None result is returned as None; it is cached for
+        NEGATIVE_CACHE_TTL seconds if cache_missing is set.
+        """
+        soft_ttl, ttl = CacheManager.CACHE_POLICIES.get(policy, (CacheManager.CACHE_TTL, CacheManager.CACHE_TTL))
+
+        async def compute_entry() -> Optional[CacheEntry]:
+            started = time.perf_counter()
+            value = await compute()
+            if value is None:
+                if not cache_missing:
+                    return None
+                return CacheManager.encode(None, compute_time=time.perf_counter() - started,
+                                           fresh_for=NEGATIVE_CACHE_TTL)
+            return CacheManager.encode(value, adapter, headers(value) if headers else None,
+                                       time.perf_counter() - started, min(soft_ttl, ttl))
+
+        entry = await AsyncCacheManager.get_entry(key)
+        if entry is None:
+            entry = await AsyncCacheManager._compute_once(key, compute_entry, ttl, stale=False)
+        elif CacheManager.needs_refresh(entry.compute_time, entry.fresh_until) and key not in AsyncCacheManager._inflight:
+            task = asyncio.create_task(AsyncCacheManager._refresh(key, compute_entry, ttl))
+            # The event loop keeps only weak references to tasks
+            AsyncCacheManager._background_tasks.add(task)
+            task.add_done_callback(AsyncCacheManager._background_tasks.discard)
+        if entry is None or entry.body == CacheManager.MISSING_BODY:
+            return None
+        return entry
+
+    @staticmethod
+    async def _refresh(key: str, compute: Callable[[], Awaitable[Optional[CacheEntry]]], ttl: int) -> None:
+        """Recompute a stale entry in the background"""
         try:
-            redis_client.delete(key)
-            return True
+            await AsyncCacheManager._compute_once(key, compute, ttl, stale=True)
         except Exception as e:
-            print(f"Cache delete error: {e}")
-        return False
+            print(f"Cache refresh error: {e}")
+
+    @staticmethod
+    async def _compute_once(key: str, compute: Callable[[], Awaitable[Optional[CacheEntry]]], ttl: int,
+                            stale: bool) -> Optional[CacheEntry]:
+        """Compute entry, concurrent callers of this worker wait for the same computation"""
+        future = AsyncCacheManager._inflight.get(key)
+        if future is not None:
+            # Another request of this worker is already computing the key
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        AsyncCacheManager._inflight[key] = future
+        try:
+            entry = await AsyncCacheManager._compute_with_lock(key, compute, ttl, stale)
+            future.set_result(entry)
+            return entry
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # waiters re-raise it; mark as retrieved if there are none
+            raise
+        finally:
+            AsyncCacheManager._inflight.pop(key, None)
 
     @staticmethod
-    def invalidate_pattern(pattern: str) -> int:
-        """Invalidate all keys matching pattern"""
+    async def _keep_lock(lock_key: str, lock_token: str) -> None:
+        """Extend the recompute lock while its holder is still computing"""
+        while True:
+            await asyncio.sleep(CACHE_LOCK_TTL / 3)
+            try:
+                if await async_redis_client.get(lock_key) != lock_token.encode():
+                    return
+                await async_redis_client.expire(lock_key, CACHE_LOCK_TTL)
+            except Exception as e:
+                print(f"Cache lock renewal error: {e}")
+
+    @staticmethod
+    async def _compute_with_lock(key: str, compute: Callable[[], Awaitable[Optional[CacheEntry]]], ttl: int,
+                                 stale: bool) -> Optional[CacheEntry]:
+        """Compute entry holding a Redis lock so only one worker queries the database"""
+        lock_key = f"lock:{key}"
+        lock_token = secrets.token_hex(8)
+        locked = False
+        if REDIS_AVAILABLE:
+            try:
+                locked = bool(await async_redis_client.set(lock_key, lock_token, nx=True, ex=CACHE_LOCK_TTL))
+            except Exception as e:
+                print(f"Cache lock error: {e}")
+
+            if not locked and stale:
+                # The stale entry is already being refreshed by another worker
+                return await AsyncCacheManager.get_entry(key)
+            if not locked:
+                # Wait for the worker holding the lock to fill the cache
+                deadline = time.monotonic() + CACHE_LOCK_MAX_WAIT
+                interval = CACHE_LOCK_POLL_INTERVAL
+                while time.monotonic() < deadline:
+                    await asyncio.sleep(interval)
+                    interval = min(interval * 2, 0.5)
+                    local_cache.delete(key)
+                    entry = await AsyncCacheManager.get_entry(key)
+                    if entry is not None:
+                        return entry
+                    try:
+                        if not await async_redis_client.exists(lock_key):
+                            break
+                    except Exception:
+                        break
+
+        renewal = asyncio.create_task(AsyncCacheManager._keep_lock(lock_key, lock_token)) if locked else None
+        try:
+            entry = await compute()
+            if entry is not None:
+                missing = entry.body == CacheManager.MISSING_BODY
+                await AsyncCacheManager.store(key, entry, NEGATIVE_CACHE_TTL if missing else ttl)
+                computed = AsyncCacheManager.computed_keys.get()
+                if computed is not None:
+                    computed.append(key)
+            return entry
+        finally:
+            if renewal is not None:
+                renewal.cancel()
+            if locked:
+                try:
+                    if await async_redis_client.get(lock_key) == lock_token.encode():
+                        await async_redis_client.delete(lock_key)
+                except Exception as e:
+                    print(f"Cache unlock error: {e}")
+
+
+class TokenCache:
+    """Bounded LRU cache of verified access tokens with per-entry expiry
+
+    Entries are keyed by the SHA256 digest of the token, so evictions can be
+    broadcast to the other workers without exposing the token.
+    """
+
+    def __init__(self, maxsize: int = TOKEN_CACHE_SIZE, ttl: float = TOKEN_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()  # token digest -> (expires at, user info)
+        self._user_tokens: Dict[int, set] = {}
+        self._lock = threading.Lock()
+        self._pubsub_thread = None
+
+    @staticmethod
+    def digest(token: str) -> str:
+        """Cache key of a token"""
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> Optional[Dict]:
+        """Get cached user info of a token"""
+        key = self.digest(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, token: str, user_info: Dict, token_expires_at: datetime) -> None:
+        """Cache user info of a token, never past the token's own expiry"""
+        ttl = min(self.ttl, (token_expires_at - datetime.utcnow()).total_seconds())
+        if ttl <= 0:
+            return
+        key = self.digest(token)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, user_info)
+            self._user_tokens.setdefault(user_info['user_id'], set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_token(self, token: str) -> None:
+        """Evict one token in every worker"""
+        self._publish("token", self.digest(token))
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Evict all tokens of a user in every worker"""
+        self._publish("user", user_id)
+
+    async def ainvalidate_token(self, token: str) -> None:
+        """invalidate_token for the event loop, publishes without blocking it"""
+        await self._apublish("token", self.digest(token))
+
+    async def ainvalidate_user(self, user_id: int) -> None:
+        """invalidate_user for the event loop, publishes without blocking it"""
+        await self._apublish("user", user_id)
+
+    def _publish(self, kind: str, ident) -> None:
+        self._evict(kind, ident)
         if not REDIS_AVAILABLE:
-            return 0
+            return
         try:
-            keys = redis_client.keys(pattern)
-            if keys:
-                return redis_client.delete(*keys)
+            redis_client.publish(TOKEN_CACHE_INVALIDATION_CHANNEL, json.dumps([kind, ident]))
         except Exception as e:
-            print(f"Cache invalidate error: {e}")
-        return 0
+            print(f"Token cache invalidation error: {e}")
+
+    async def _apublish(self, kind: str, ident) -> None:
+        self._evict(kind, ident)
+        if not REDIS_AVAILABLE:
+            return
+        try:
+            await async_redis_client.publish(TOKEN_CACHE_INVALIDATION_CHANNEL, json.dumps([kind, ident]))
+        except Exception as e:
+            print(f"Token cache invalidation error: {e}")
+
+    def _evict(self, kind: str, ident) -> None:
+        with self._lock:
+            if kind == "token":
+                if ident in self._entries:
+                    self._remove(ident)
+            else:
+                for key in list(self._user_tokens.get(ident, ())):
+                    self._remove(key)
+
+    def _remove(self, key: str) -> None:
+        _, user_info = self._entries.pop(key)
+        tokens = self._user_tokens.get(user_info['user_id'])
+        if tokens is not None:
+            tokens.discard(key)
+            if not tokens:
+                del self._user_tokens[user_info['user_id']]
+
+    def _on_message(self, message: Dict) -> None:
+        try:
+            self._evict(*json.loads(message['data']))
+        except (ValueError, TypeError) as e:
+            print(f"Token cache invalidation message error: {e}")
+
+    def start(self) -> None:
+        """Subscribe to evictions made by the other workers"""
+        if not REDIS_AVAILABLE or self._pubsub_thread is not None:
+            return
+        pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{TOKEN_CACHE_INVALIDATION_CHANNEL: self._on_message})
+        self._pubsub_thread = pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+
+    def stop(self) -> None:
+        """Stop the subscriber thread"""
+        if self._pubsub_thread is not None:
+            self._pubsub_thread.stop()
+            self._pubsub_thread = None
+
+    def stats(self) -> Dict:
+        """Cache size and hit statistics"""
+        with self._lock:
+            return {'size': len(self._entries), 'maxsize': self.maxsize, 'ttl': self.ttl,
+                    'hits': self.hits, 'misses': self.misses}
+
+
+token_cache = TokenCache()
+
+
+class TokenRevocationList:
+    """Revoked signed tokens (by token ID) and users whose earlier tokens are revoked
+
+    Checks are in memory only. Revocations are stored in Redis with the
+    remaining token lifetime as TTL, for workers started later, and
+    broadcast to the running workers over pub/sub.
+    """
+
+    KEY_PREFIX = "auth:revoked"
+
+    def __init__(self):
+        self._tokens: Dict[str, float] = {}  # token id -> expires at, epoch seconds
+        self._users: Dict[int, float] = {}  # user id -> tokens issued until then (epoch ms) are revoked
+        self._lock = threading.Lock()
+        self._pubsub_thread = None
+        self._next_prune = 0.0
+
+    def is_revoked(self, claims: Dict) -> bool:
+        """Check claims of a valid signed token"""
+        return claims['jti'] in self._tokens or claims['iat'] <= self._users.get(claims['uid'], -1)
+
+    def revoke_token(self, token_id: str, expires_at: float) -> None:
+        """Revoke one token until it expires"""
+        self._publish(f"token:{token_id}", expires_at)
+
+    def revoke_user(self, user_id: int) -> None:
+        """Revoke all tokens issued to the user so far
+
+        Compared with the millisecond "iat" claim, so a token issued right
+        after a reactivation is not caught by a revocation in the same second.
+        """
+        self._publish(f"user:{user_id}", time.time() * 1000)
+
+    async def arevoke_token(self, token_id: str, expires_at: float) -> None:
+        """revoke_token for the event loop, stores and publishes without blocking it"""
+        await self._apublish(f"token:{token_id}", expires_at)
+
+    async def arevoke_user(self, user_id: int) -> None:
+        """revoke_user for the event loop, stores and publishes without blocking it"""
+        await self._apublish(f"user:{user_id}", time.time() * 1000)
+
+    def _queue(self, pipe, entry: str, value: float) -> None:
+        """Add storing and broadcasting a revocation to a Redis pipeline"""
+        # Tokens expire at the latest ACCESS_TOKEN_LIFETIME after they are issued
+        ttl = ACCESS_TOKEN_LIFETIME.total_seconds()
+        if entry.startswith("token:"):
+            ttl = value - time.time()
+        pipe.set(f"{self.KEY_PREFIX}:{entry}", value, ex=max(1, int(ttl) + 1))
+        pipe.publish(TOKEN_REVOCATION_CHANNEL, json.dumps([entry, value]))
+
+    def _publish(self, entry: str, value: float) -> None:
+        self._apply(entry, value)
+        if not REDIS_AVAILABLE:
+            return
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            self._queue(pipe, entry, value)
+            pipe.execute()
+        except Exception as e:
+            print(f"Token revocation error: {e}")
+
+    async def _apublish(self, entry: str, value: float) -> None:
+        self._apply(entry, value)
+        if not REDIS_AVAILABLE:
+            return
+        try:
+            async with async_redis_client.pipeline(transaction=False) as pipe:
+                self._queue(pipe, entry, value)
+                await pipe.execute()
+        except Exception as e:
+            print(f"Token revocation error: {e}")
+
+    def _apply(self, entry: str, value: float) -> None:
+        kind, ident = entry.split(":", 1)
+        with self._lock:
+            if kind == "token":
+                self._tokens[ident] = value
+            else:
+                self._users[int(ident)] = max(value, self._users.get(int(ident), value))
+            now = time.time()
+            if now >= self._next_prune:
+                # Expired tokens fail verification anyway
+                horizon = (now - ACCESS_TOKEN_LIFETIME.total_seconds()) * 1000
+                self._tokens = {k: v for k, v in self._tokens.items() if v > now}
+                self._users = {k: v for k, v in self._users.items() if v > horizon}
+                self._next_prune = now + 60
+
+    def _on_message(self, message: Dict) -> None:
+        try:
+            self._apply(*json.loads(message['data']))
+        except (ValueError, TypeError) as e:
+            print(f"Token revocation message error: {e}")
+
+    def start(self) -> None:
+        """Load stored revocations and subscribe to new ones"""
+        if not REDIS_AVAILABLE or self._pubsub_thread is not None:
+            return
+        pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{TOKEN_REVOCATION_CHANNEL: self._on_message})
+        self._pubsub_thread = pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+        try:
+            keys = list(redis_client.scan_iter(f"{self.KEY_PREFIX}:*", count=1000))
+            for key, value in zip(keys, redis_client.mget(keys) if keys else []):
+                if value is not None:
+                    self._apply(key.decode()[len(self.KEY_PREFIX) + 1:], float(value))
+        except Exception as e:
+            print(f"Token revocation load error: {e}")
+
+    def stop(self) -> None:
+        """Stop the subscriber thread"""
+        if self._pubsub_thread is not None:
+            self._pubsub_thread.stop()
+            self._pubsub_thread = None
+
+    def stats(self) -> Dict:
+        """Number of revocations kept in memory"""
+        with self._lock:
+            return {'mode': AUTH_TOKEN_MODE, 'revoked_tokens': len(self._tokens), 'revoked_users': len(self._users)}
+
+
+revoked_tokens = TokenRevocationList()
+
+
+class PasswordHashingBusy(Exception):
+    """The password hashing pool has no free queue slots"""
+
+
+class PasswordHasher:
+    """Bounded thread pool for password hashing and verification
+
+    hashlib KDFs release the GIL, so a few threads use several cores while the
+    event loop keeps serving requests. At most `queue_limit` calls may be
+    queued or running; further calls fail fast with PasswordHashingBusy.
+    """
+
+    def __init__(self, workers: int = PASSWORD_HASH_WORKERS, queue_limit: int = PASSWORD_HASH_QUEUE_LIMIT):
+        self.workers = workers
+        self.queue_limit = max(queue_limit, workers)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._slots = threading.BoundedSemaphore(self.queue_limit)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def submit(self, func: Callable, *args) -> Future:
+        """Schedule func(*args) in the pool or raise PasswordHashingBusy"""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise PasswordHashingBusy()
+        with self._lock:
+            self._in_flight += 1
+        future = self._executor.submit(func, *args)
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, _future: Future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._completed += 1
+        self._slots.release()
+
+    async def run(self, func: Callable, *args):
+        """Await func(*args) computed in the pool"""
+        return await asyncio.wrap_future(self.submit(func, *args))
+
+    def stats(self) -> Dict:
+        """Pool size, current queue depth and counters"""
+        with self._lock:
+            return {
+                'kdf': PASSWORD_KDF,
+                'cost': PASSWORD_KDF_COST,
+                'workers': self.workers,
+                'queue_limit': self.queue_limit,
+                'in_flight': self._in_flight,
+                'completed': self._completed,
+                'rejected': self._rejected
+            }
+
+
+password_hasher = PasswordHasher()
+
+
+class SlidingWindowCounter:
+    """Sliding window request counters kept in this worker's memory"""
+
+    backend = "memory"
+
+    def __init__(self, window: int = LOGIN_RATE_LIMIT_WINDOW, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.window = window
+        self.max_keys = max_keys
+        self._counters: Dict[str, List[int]] = {}  # key -> [window index, current count, previous count]
+        self._lock = threading.Lock()
+
+    def _position(self) -> Tuple[int, float]:
+        """Index of the current fixed window and the elapsed share of it"""
+        now = time.time()
+        return int(now // self.window), (now % self.window) / self.window
+
+    def estimate(self, current: int, previous: int, elapsed: float) -> float:
+        """Requests in the sliding window ending now"""
+        return current + previous * (1 - elapsed)
+
+    async def hit(self, key: str) -> Tuple[float, float]:
+        """Count one request, return (requests in the window, seconds until the current window ends)"""
+        index, elapsed = self._position()
+        with self._lock:
+            counter = self._counters.get(key)
+            if counter is None or counter[0] < index - 1:
+                counter = [index, 0, 0]
+            elif counter[0] == index - 1:
+                counter = [index, 0, counter[1]]
+            counter[1] += 1
+            self._counters[key] = counter
+            if len(self._counters) > self.max_keys:
+                self._prune(index)
+        return self.estimate(counter[1], counter[2], elapsed), (1 - elapsed) * self.window
+
+    def _prune(self, index: int) -> None:
+        """Drop counters that no longer reach into the sliding window"""
+        for key in [key for key, counter in self._counters.items() if counter[0] < index - 1]:
+            del self._counters[key]
+
+
+class RedisSlidingWindowCounter(SlidingWindowCounter):
+    """Sliding window counters in Redis, shared by all workers
+
+    Falls back to the in-memory counters while Redis is unreachable.
+    """
+
+    backend = "redis"
+    KEY_PREFIX = "ratelimit"
+
+    async def hit(self, key: str) -> Tuple[float, float]:
+        index, elapsed = self._position()
+        current_key = f"{self.KEY_PREFIX}:{key}:{index}"
+        try:
+            async with async_redis_client.pipeline(transaction=False) as pipe:
+                pipe.incr(current_key)
+                pipe.expire(current_key, 2 * self.window)
+                pipe.get(f"{self.KEY_PREFIX}:{key}:{index - 1}")
+                current, _, previous = await pipe.execute()
+        except redis.RedisError:
+            return await super().hit(key)
+        return self.estimate(current, int(previous or 0), elapsed), (1 - elapsed) * self.window
+
+
+class LoginRateLimiter:
+    """Per-username and per-IP limits of login and register attempts"""
+
+    def __init__(self, counter: SlidingWindowCounter, per_username: int = LOGIN_RATE_LIMIT_PER_USERNAME,
+                 per_ip: int = LOGIN_RATE_LIMIT_PER_IP):
+        self.counter = counter
+        self.limits = {'username': per_username, 'ip': per_ip}
+        self.allowed = 0
+        self.rejected = {'username': 0, 'ip': 0}
+
+    async def check(self, action: str, username: str, client_ip: str) -> Optional[float]:
+        """Count an attempt, return seconds to wait if it exceeds a limit, None if allowed"""
+        for scope, value in (('ip', client_ip), ('username', username.lower())):
+            count, retry_after = await self.counter.hit(f"{action}:{scope}:{value}")
+            if count > self.limits[scope]:
+                self.rejected[scope] += 1
+                return retry_after
+        self.allowed += 1
+        return None
+
+    def stats(self) -> Dict:
+        """Backend, limits and how many attempts were allowed and rejected by this worker"""
+        return {
+            'backend': self.counter.backend,
+            'window_seconds': self.counter.window,
+            'limits': self.limits,
+            'allowed': self.allowed,
+            'rejected': self.rejected
+        }
+
+
+login_rate_limiter = LoginRateLimiter(RedisSlidingWindowCounter() if REDIS_AVAILABLE else SlidingWindowCounter())
+
+
+async def enforce_login_rate_limit(action: str, username: str, request: Request) -> None:
+    """Raise 429 if the client or the username made too many attempts"""
+    client_ip = request.client.host if request.client else "unknown"
+    retry_after = await login_rate_limiter.check(action, username, client_ip)
+    if retry_after is not None:
+        raise HTTPException(status_code=429, detail="Too many attempts, retry later",
+                            headers={"Retry-After": str(max(1, math.ceil(retry_after)))})
 
 
 class Student(Base):
@@ -106,6 +1245,15 @@ class Student(Base):
     course = Column(String, nullable=False)
     score = Column(Integer, nullable=False)
 
+    # (faculty, score) covers the average score query; (course, score) covers
+    # DISTINCT course and the low score range scan. Full-row faculty lookups
+    # gain most for small faculties; the planner weighs the index against a
+    # scan using the ANALYZE statistics migrate_schema refreshes.
+    __table_args__ = (
+        Index('ix_students_faculty_score', 'faculty', 'score'),
+        Index('ix_students_course_score', 'course', 'score'),
+    )
+
 
 class User(Base):
     __tablename__ = 'users'
@@ -124,12 +1272,197 @@ class Session(Base):
 
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, nullable=False, index=True)
-    token = Column(String, unique=True, nullable=False, index=True)
-    refresh_token = Column(String, unique=True, nullable=False, index=True)
+    token = Column(String, nullable=False)
+    refresh_token = Column(String, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     expires_at = Column(DateTime, nullable=False)
     is_active = Column(Boolean, default=True)
 
+    # Token lookups always filter on is_active = 1, so the token indexes only
+    # hold active sessions. The sweeper finds its rows through the expiry index
+    # and the index of logged out sessions.
+    __table_args__ = (
+        Index('ix_sessions_active_token', 'token', unique=True, sqlite_where=text('is_active = 1')),
+        Index('ix_sessions_active_refresh_token', 'refresh_token', unique=True,
+              sqlite_where=text('is_active = 1')),
+        Index('ix_sessions_expires_at', 'expires_at'),
+        Index('ix_sessions_inactive', 'id', sqlite_where=text('is_active = 0')),
+    )
+
+
+class ImportCheckpoint(Base):
+    __tablename__ = 'import_checkpoints'
+
+    id = Column(Integer, primary_key=True)
+    csv_file = Column(String, unique=True, nullable=False, index=True)
+    byte_offset = Column(Integer, nullable=False, default=0)
+    rows_imported = Column(Integer, nullable=False, default=0)
+    boundary_digest = Column(String, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+
+class ImportLock(Base):
+    __tablename__ = 'import_locks'
+
+    csv_file = Column(String, primary_key=True)
+    owner = Column(String, nullable=False)
+    heartbeat_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+class ImportInProgress(Exception):
+    """Another worker is already importing the same CSV file"""
+
+
+# Indexes of earlier schema versions replaced by the ones declared on the models
+OBSOLETE_INDEXES = ('ix_sessions_token', 'ix_sessions_refresh_token')
+
+
+def migrate_schema(engine) -> List[str]:
+    """Create missing tables and indexes in an existing database
+
+    create_all only creates indexes together with new tables, so indexes added
+    to models later are created here and obsolete ones are dropped. Returns
+    names of the created indexes.
+    """
+    try:
+        Base.metadata.create_all(engine)
+    except OperationalError:
+        # Another worker created a table between the existence check and
+        # CREATE TABLE; a second pass sees it, real errors are raised again
+        Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        for name in OBSOLETE_INDEXES:
+            conn.execute(text(f'DROP INDEX IF EXISTS {name}'))
+    inspector = inspect(engine)
+    created = []
+    for table in Base.metadata.sorted_tables:
+        existing = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                try:
+                    index.create(engine)
+                except OperationalError:
+                    if index.name not in {i['name'] for i in inspect(engine).get_indexes(table.name)}:
+                        raise
+                    continue
+                created.append(index.name)
+    if created:
+        # Refresh planner statistics so the new indexes get picked up
+        with engine.begin() as conn:
+            conn.execute(text('ANALYZE'))
+    return created
+
+
+def apply_sqlite_pragmas(dbapi_connection, profile: str = SQLITE_PROFILE) -> None:
+    """Apply a PRAGMA profile to a raw SQLite connection"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in SQLITE_PRAGMA_PROFILES[profile].items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+    finally:
+        cursor.close()
+
+
+@contextmanager
+def sqlite_profile(conn: Connection, profile: str):
+    """Temporarily switch one connection to another PRAGMA profile"""
+    if conn.dialect.name != 'sqlite':
+        yield conn
+        return
+    dbapi_connection = conn.connection.dbapi_connection
+    apply_sqlite_pragmas(dbapi_connection, profile)
+    try:
+        yield conn
+    finally:
+        # The connection goes back to the pool with the default profile
+        apply_sqlite_pragmas(dbapi_connection, SQLITE_PROFILE)
+
+
+_engines: Dict[str, Engine] = {}
+_engines_lock = threading.Lock()
+
+
+def get_engine(db_url: str = DATABASE_URL) -> Engine:
+    """Get the shared engine for a database URL
+
+    The engine, its connection pool and the schema check are created once per
+    URL, every manager working on the same database reuses them.
+    """
+    engine = _engines.get(db_url)
+    if engine is not None:
+        return engine
+    with _engines_lock:
+        engine = _engines.get(db_url)
+        if engine is None:
+            if db_url.startswith('sqlite') and ':memory:' not in db_url and db_url != 'sqlite://':
+                # Pooled connections are handed between threads
+                engine = create_engine(db_url, poolclass=QueuePool,
+                                       connect_args={'check_same_thread': False}, **pool_config(db_url))
+            elif db_url.startswith('sqlite'):
+                engine = create_engine(db_url)
+            else:
+                engine = create_engine(db_url, **pool_config(db_url))
+            if engine.dialect.name == 'sqlite':
+                event.listen(engine, 'connect', lambda dbapi_connection, _: apply_sqlite_pragmas(dbapi_connection))
+            migrate_schema(engine)
+            _engines[db_url] = engine
+    return engine
+
+
+_async_engines: Dict[str, AsyncEngine] = {}
+
+
+def to_async_url(db_url: str) -> str:
+    """Database URL with the asyncio driver of its dialect"""
+    if db_url.startswith('sqlite:'):
+        return db_url.replace('sqlite:', 'sqlite+aiosqlite:', 1)
+    if db_url.startswith('postgresql:'):
+        return db_url.replace('postgresql:', 'postgresql+asyncpg:', 1)
+    return db_url
+
+
+def get_async_engine(db_url: str = DATABASE_URL) -> AsyncEngine:
+    """Get the shared asyncio engine for a database URL
+
+    The schema is checked through the sync engine of the same URL, the async
+    engine gets its own pool with the same settings and PRAGMA profile.
+    """
+    engine = _async_engines.get(db_url)
+    if engine is not None:
+        return engine
+    get_engine(db_url)
+    with _engines_lock:
+        engine = _async_engines.get(db_url)
+        if engine is None:
+            async_url = to_async_url(db_url)
+            if db_url.startswith('sqlite') and (':memory:' in db_url or db_url == 'sqlite://'):
+                engine = create_async_engine(async_url)
+            else:
+                engine = create_async_engine(async_url, poolclass=AsyncAdaptedQueuePool, **pool_config(db_url))
+            if engine.dialect.name == 'sqlite':
+                event.listen(engine.sync_engine, 'connect',
+                             lambda dbapi_connection, _: apply_sqlite_pragmas(dbapi_connection))
+            _async_engines[db_url] = engine
+    return engine
+
+
+def get_pool_stats(engine: Engine) -> Dict:
+    """Connection pool statistics of an engine"""
+    pool = engine.pool
+    stats = {'pool_class': type(pool).__name__, 'status': pool.status()}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            'size': pool.size(),
+            'checked_in': pool.checkedin(),
+            'checked_out': pool.checkedout(),
+            'overflow': pool.overflow(),
+            'max_overflow': DB_POOL_CONFIG['max_overflow']
+        })
+    return stats
+
+
+engine = get_engine()
+
 
 # Pydantic models for API requests/responses
 class StudentCreate(BaseModel):
@@ -160,6 +1493,12 @@ class StudentResponse(BaseModel):
         from_attributes = True
 
 
+# Cached endpoints encode their responses once, on a cache miss
+STUDENT_ADAPTER = TypeAdapter(StudentResponse)
+STUDENT_LIST_ADAPTER = TypeAdapter(List[StudentResponse])
+COURSE_LIST_ADAPTER = TypeAdapter(List[str])
+
+
 # Authentication models
 class UserRegister(BaseModel):
     username: str
@@ -201,28 +1540,48 @@ class AuthUser(BaseModel):
 
 
 class StudentManager:
-    def __init__(self, db_path='sqlite:///students.db'):
-        self.engine = create_engine(db_path)
-        Base.metadata.create_all(self.engine)
+    def __init__(self, db_path=DATABASE_URL):
+        self.engine = get_engine(db_path)
         self.Session = sessionmaker(bind=self.engine)
 
-    def populate_from_csv(self, csv_file: str) -> None:
-        session = self.Session()
-        try:
-            with open(csv_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    student = Student(
-                        last_name=row['Фамилия'],
-                        first_name=row['Имя'],
-                        faculty=row['Факультет'],
-                        course=row['Курс'],
-                        score=int(row['Оценка'])
-                    )
-                    session.add(student)
-            session.commit()
-        finally:
-            session.close()
+    @staticmethod
+    def parse_csv_row(row: Dict) -> Dict:
+        """Convert a CSV row into a students table row"""
+        return {
+            'last_name': row['Фамилия'],
+            'first_name': row['Имя'],
+            'faculty': row['Факультет'],
+            'course': row['Курс'],
+            'score': int(row['Оценка'])
+        }
+
+    def bulk_insert(self, rows: Iterable[Dict], chunk_size: int = IMPORT_CHUNK_SIZE) -> int:
+        """Insert rows with executemany-style Core inserts, one transaction per chunk"""
+        insert_stmt = Student.__table__.insert()
+        rows = iter(rows)
+        count = 0
+        with self.engine.connect() as conn, sqlite_profile(conn, 'bulk-load'):
+            while True:
+                chunk = list(islice(rows, chunk_size))
+                if not chunk:
+                    break
+                with conn.begin():
+                    conn.execute(insert_stmt, chunk)
+                count += len(chunk)
+        return count
+
+    def populate_from_csv(self, csv_file: str, chunk_size: int = IMPORT_CHUNK_SIZE) -> Dict:
+        """Bulk load students from CSV file and report import speed"""
+        started = time.perf_counter()
+        with open(csv_file, 'r', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            count = self.bulk_insert((self.parse_csv_row(row) for row in reader), chunk_size)
+        elapsed = time.perf_counter() - started
+        return {
+            'records_imported': count,
+            'elapsed_seconds': round(elapsed, 3),
+            'rows_per_second': round(count / elapsed) if elapsed > 0 else count
+        }
 
     def get_students_by_faculty(self, faculty: str) -> List[Dict]:
         session = self.Session()
@@ -253,6 +1612,14 @@ class StudentManager:
         finally:
             session.close()
 
+    def get_faculties(self) -> List[str]:
+        session = self.Session()
+        try:
+            faculties = session.query(Student.faculty).distinct().all()
+            return [faculty[0] for faculty in faculties]
+        finally:
+            session.close()
+
     def get_average_score_by_faculty(self, faculty: str) -> float:
         session = self.Session()
         try:
@@ -351,6 +1718,47 @@ class StudentManager:
         finally:
             session.close()
 
+    def count_students(self) -> int:
+        """Get number of students"""
+        session = self.Session()
+        try:
+            return session.query(func.count(Student.id)).scalar()
+        finally:
+            session.close()
+
+    def get_students_page(self, limit: int = DEFAULT_PAGE_SIZE, after: Optional[int] = None) -> List[Dict]:
+        """Get up to `limit` students with id greater than `after` (keyset pagination)"""
+        session = self.Session()
+        try:
+            query = session.query(Student)
+            if after is not None:
+                query = query.filter(Student.id > after)
+            students = query.order_by(Student.id).limit(limit).all()
+            result = [
+                {
+                    'id': s.id,
+                    'last_name': s.last_name,
+                    'first_name': s.first_name,
+                    'faculty': s.faculty,
+                    'course': s.course,
+                    'score': s.score
+                }
+                for s in students
+            ]
+            return result
+        finally:
+            session.close()
+
+    def iter_students(self, after: Optional[int] = None, batch_size: int = STREAM_BATCH_SIZE) -> Iterator[Dict]:
+        """Yield students in id order from a server-side cursor"""
+        stmt = select(Student.__table__).order_by(Student.id)
+        if after is not None:
+            stmt = stmt.where(Student.id > after)
+        with self.engine.connect() as conn:
+            result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(stmt)
+            for row in result:
+                yield dict(row._mapping)
+
     def update_student(self, student_id: int, **kwargs) -> Optional[Dict]:
         """Update student record"""
         session = self.Session()
@@ -389,43 +1797,248 @@ class StudentManager:
         finally:
             session.close()
 
-    def populate_from_csv_background(self, csv_file: str) -> Dict:
-        """Populate database from CSV file (background task)"""
+    def get_import_checkpoint(self, csv_file: str) -> Optional[Dict]:
+        """Get last committed checkpoint of a CSV import, if it still fits the file"""
+        csv_path = os.path.abspath(csv_file)
+        file_size = os.path.getsize(csv_path)
         session = self.Session()
         try:
-            count = 0
-            with open(csv_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    student = Student(
-                        last_name=row['Фамилия'],
-                        first_name=row['Имя'],
-                        faculty=row['Факультет'],
-                        course=row['Курс'],
-                        score=int(row['Оценка'])
-                    )
-                    session.add(student)
-                    count += 1
-            session.commit()
+            checkpoint = session.query(ImportCheckpoint).filter(
+                ImportCheckpoint.csv_file == csv_path
+            ).first()
+            if not checkpoint:
+                return None
+            # The rows before the offset must be the ones that were imported
+            if checkpoint.byte_offset > file_size:
+                return None
+            if csv_boundary_digest(csv_path, checkpoint.byte_offset) != checkpoint.boundary_digest:
+                return None
+            return {
+                'csv_file': checkpoint.csv_file,
+                'byte_offset': checkpoint.byte_offset,
+                'rows_imported': checkpoint.rows_imported,
+                'updated_at': checkpoint.updated_at
+            }
+        finally:
+            session.close()
+
+    def clear_import_checkpoint(self, csv_file: str) -> None:
+        """Forget the checkpoint of a CSV import"""
+        with self.engine.begin() as conn:
+            conn.execute(ImportCheckpoint.__table__.delete().where(
+                ImportCheckpoint.csv_file == os.path.abspath(csv_file)
+            ))
+
+    def _acquire_import_lock(self, csv_path: str) -> str:
+        """Claim the import of a CSV file for this run, returning the owner token
+
+        The lock is a row in import_locks keyed by the file path, so a second
+        submission of the same file fails on the primary key whichever worker
+        runs it. A lock whose heartbeat stopped is left by a crashed import
+        and is taken over.
+        """
+        owner = uuid.uuid4().hex
+        stale_before = datetime.utcnow() - timedelta(seconds=IMPORT_LOCK_STALE_SECONDS)
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(delete(ImportLock).where(
+                    ImportLock.csv_file == csv_path,
+                    ImportLock.heartbeat_at < stale_before
+                ))
+                conn.execute(ImportLock.__table__.insert(), {
+                    'csv_file': csv_path, 'owner': owner, 'heartbeat_at': datetime.utcnow()
+                })
+        except IntegrityError:
+            raise ImportInProgress(csv_path) from None
+        return owner
+
+    def _release_import_lock(self, csv_path: str, owner: str) -> None:
+        """Drop the import lock if this run still owns it"""
+        with self.engine.begin() as conn:
+            conn.execute(delete(ImportLock).where(
+                ImportLock.csv_file == csv_path, ImportLock.owner == owner
+            ))
+
+    def is_import_running(self, csv_file: str) -> bool:
+        """Check whether an import of the CSV file holds a live lock"""
+        stale_before = datetime.utcnow() - timedelta(seconds=IMPORT_LOCK_STALE_SECONDS)
+        with self.engine.connect() as conn:
+            return conn.execute(select(ImportLock.owner).where(
+                ImportLock.csv_file == os.path.abspath(csv_file),
+                ImportLock.heartbeat_at >= stale_before
+            )).first() is not None
+
+    @staticmethod
+    def _renew_import_lock(conn, csv_path: str, owner: str) -> None:
+        """Refresh the lock heartbeat in the transaction of a chunk"""
+        result = conn.execute(update(ImportLock).where(
+            ImportLock.csv_file == csv_path, ImportLock.owner == owner
+        ).values(heartbeat_at=datetime.utcnow()))
+        if result.rowcount == 0:
+            # The lock was taken over, the chunk is rolled back
+            raise ImportInProgress(csv_path)
+
+    @staticmethod
+    def _save_import_checkpoint(conn, csv_path: str, byte_offset: int, rows_imported: int) -> None:
+        """Store checkpoint in the same transaction as the rows it covers
+
+        Only the holder of the import lock writes the checkpoint of a file, so
+        the update-then-insert below does not race with another import.
+        """
+        values = {
+            'byte_offset': byte_offset,
+            'rows_imported': rows_imported,
+            'boundary_digest': csv_boundary_digest(csv_path, byte_offset),
+            'updated_at': datetime.utcnow()
+        }
+        result = conn.execute(
+            update(ImportCheckpoint).where(ImportCheckpoint.csv_file == csv_path).values(**values)
+        )
+        if result.rowcount == 0:
+            conn.execute(ImportCheckpoint.__table__.insert(), {'csv_file': csv_path, **values})
+
+    def _serial_batches(self, csv_path: str, start_offset: int,
+                        chunk_size: int) -> Iterator[Tuple[List[StudentValues], int]]:
+        """Parse CSV in this process, yielding (rows, byte offset after the last row)"""
+        rows = iter_csv_rows(csv_path, start_offset)
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                return
+            yield [row_values(row) for row, _ in chunk], chunk[-1][1]
+
+    @staticmethod
+    def _parallel_batches(csv_path: str, start_offset: int,
+                          workers: int) -> Iterator[Tuple[List[StudentValues], int]]:
+        """Parse CSV byte ranges in a process pool, yielding (rows, range end) in file order"""
+        header, ranges = split_csv_ranges(csv_path, start_offset, IMPORT_RANGE_BYTES)
+        ranges = iter(ranges)
+        pool = parser_pool(workers)
+        try:
+            # Keep a bounded number of ranges in flight so memory stays flat
+            pending = deque(
+                (end, pool.submit(parse_csv_range, csv_path, header, start, end))
+                for start, end in islice(ranges, workers * 2)
+            )
+            while pending:
+                end, future = pending.popleft()
+                rows = future.result()
+                for start, next_end in islice(ranges, 1):
+                    pending.append((next_end, pool.submit(parse_csv_range, csv_path, header, start, next_end)))
+                yield rows, end
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _values_inserter(conn: Connection) -> Callable[[List[StudentValues]], Any]:
+        """executemany for parsed CSV tuples
+
+        On positional paramstyles (sqlite3 uses qmark) the tuples go to the
+        driver as they are, without building a dict and processing parameters
+        per row; other drivers get dicts.
+        """
+        insert_stmt = Student.__table__.insert()
+        compiled = insert_stmt.compile(dialect=conn.dialect, column_keys=list(STUDENT_COLUMNS))
+        if conn.dialect.positional and tuple(compiled.positiontup) == STUDENT_COLUMNS:
+            return partial(conn.exec_driver_sql, compiled.string)
+        return lambda rows: conn.execute(insert_stmt, [dict(zip(STUDENT_COLUMNS, row)) for row in rows])
+
+    def import_csv_stream(self, csv_file: str, chunk_size: int = IMPORT_CHUNK_SIZE, restart: bool = False,
+                          workers: int = IMPORT_WORKERS) -> Dict:
+        """Stream CSV into the database, committing every chunk with a byte-offset checkpoint
+
+        Only a bounded number of chunks is held in memory at a time. Large
+        files are split into byte ranges parsed by a process pool while this
+        thread stays the single writer. If a previous import of the same file
+        was interrupted, it continues after the last committed chunk. Raises
+        ImportInProgress while another import of the file is running.
+        """
+        started = time.perf_counter()
+        csv_path = os.path.abspath(csv_file)
+        # Fail on a missing or unreadable file before taking the lock
+        os.path.getsize(csv_path)
+        owner = self._acquire_import_lock(csv_path)
+        try:
+            return self._import_locked(csv_path, owner, chunk_size, restart, workers, started)
+        finally:
+            self._release_import_lock(csv_path, owner)
+
+    def _import_locked(self, csv_path: str, owner: str, chunk_size: int, restart: bool,
+                       workers: int, started: float) -> Dict:
+        """Body of import_csv_stream, run while holding the import lock"""
+        checkpoint = None if restart else self.get_import_checkpoint(csv_path)
+        resumed_from = checkpoint['byte_offset'] if checkpoint else 0
+        total = checkpoint['rows_imported'] if checkpoint else 0
+        count = 0
+
+        remaining_bytes = os.path.getsize(csv_path) - resumed_from
+        if workers > 1 and remaining_bytes >= PARALLEL_IMPORT_MIN_BYTES:
+            batches = self._parallel_batches(csv_path, resumed_from, workers)
+        else:
+            workers = 1
+            batches = self._serial_batches(csv_path, resumed_from, chunk_size)
+
+        with self.engine.connect() as conn, sqlite_profile(conn, 'bulk-load'):
+            insert_rows = self._values_inserter(conn)
+            for batch, byte_offset in batches:
+                if not batch:
+                    continue
+                with conn.begin():
+                    self._renew_import_lock(conn, csv_path, owner)
+                    insert_rows(batch)
+                    self._save_import_checkpoint(conn, csv_path, byte_offset, total + len(batch))
+                count += len(batch)
+                total += len(batch)
+
+        # The file is fully imported, a new submission starts from scratch
+        self.clear_import_checkpoint(csv_path)
+        elapsed = time.perf_counter() - started
+        return {
+            'records_imported': count,
+            'total_records': total,
+            'resumed_from_offset': resumed_from,
+            'parser_workers': workers,
+            'elapsed_seconds': round(elapsed, 3),
+            'rows_per_second': round(count / elapsed) if elapsed > 0 else count
+        }
+
+    def populate_from_csv_background(self, csv_file: str, restart: bool = False) -> Dict:
+        """Populate database from CSV file (background task)"""
+        try:
+            stats = self.import_csv_stream(csv_file, restart=restart)
             # Invalidate all cache related to students
-            CacheManager.invalidate_pattern("cache:students*")
+            CacheManager.invalidate(CacheManager.GLOBAL_NAMESPACE)
+            message = f'Successfully imported {stats["records_imported"]} student records'
+            if stats['resumed_from_offset']:
+                message += f' (resumed at byte {stats["resumed_from_offset"]})'
             return {
                 'status': 'completed',
-                'records_imported': count,
-                'message': f'Successfully imported {count} student records'
+                **stats,
+                'message': message
             }
         except FileNotFoundError:
             return {
                 'status': 'error',
                 'message': f'File not found: {csv_file}'
             }
+        except ImportInProgress:
+            return {
+                'status': 'error',
+                'message': f'Import of {csv_file} is already running'
+            }
+        except OSError as e:
+            # Directories and unreadable files are reported like a missing file
+            return {
+                'status': 'error',
+                'message': f'Cannot read file {csv_file}: {e.strerror or e}'
+            }
         except Exception as e:
+            # Committed chunks are kept, the checkpoint lets the next run resume
+            CacheManager.invalidate(CacheManager.GLOBAL_NAMESPACE)
             return {
                 'status': 'error',
                 'message': f'Error importing CSV: {str(e)}'
             }
-        finally:
-            session.close()
 
     def delete_students_by_ids(self, student_ids: List[int]) -> Dict:
         """Delete multiple student records (background task)"""
@@ -439,7 +2052,7 @@ class StudentManager:
                     deleted_count += 1
             session.commit()
             # Invalidate all cache related to students
-            CacheManager.invalidate_pattern("cache:students*")
+            CacheManager.invalidate(CacheManager.GLOBAL_NAMESPACE)
             return {
                 'status': 'completed',
                 'records_deleted': deleted_count,
@@ -457,34 +2070,146 @@ class StudentManager:
 class AuthManager:
     """Manage user authentication and sessions"""
 
-    def __init__(self, db_path='sqlite:///students.db'):
-        self.engine = create_engine(db_path)
-        Base.metadata.create_all(self.engine)
+    # Session lookups are built once and run with parameters: one indexed join
+    # that checks the session and the user in SQL and returns only what
+    # AuthUser and the token cache need
+    TOKEN_USER_QUERY = select(
+        User.id.label('user_id'), User.username, User.is_read_only, User.is_active, Session.expires_at
+    ).select_from(Session).join(User, User.id == Session.user_id).where(
+        (Session.token == bindparam('token')) & (Session.is_active == True)
+        & (Session.expires_at > bindparam('now')) & (User.is_active == True)
+    )
+    REFRESH_SESSION_QUERY = select(
+        Session.id.label('session_id'), Session.token, User.id, User.username, User.is_read_only
+    ).select_from(Session).join(User, User.id == Session.user_id).where(
+        (Session.refresh_token == bindparam('refresh_token')) & (Session.is_active == True)
+        & (Session.expires_at > bindparam('refresh_horizon')) & (User.is_active == True)
+    )
+    # Matches nothing if the session was refreshed or logged out meanwhile
+    ROTATE_SESSION_STATEMENT = update(Session).where(
+        (Session.id == bindparam('session_id')) & (Session.refresh_token == bindparam('old_refresh_token'))
+        & (Session.is_active == True)
+    ).values(token=bindparam('new_token'), refresh_token=bindparam('new_refresh_token'),
+             expires_at=bindparam('new_expires_at'))
+
+    def __init__(self, db_path=DATABASE_URL):
+        self.engine = get_engine(db_path)
         self.Session = sessionmaker(bind=self.engine)
 
     @staticmethod
-    def hash_password(password: str) -> str:
-        """Hash password using SHA256"""
+    def derive_key(password: str, salt: str, kdf: str, cost: int) -> str:
+        """Hex digest of the password stretched with the given KDF"""
+        if kdf == 'pbkdf2_sha256':
+            return hashlib.pbkdf2_hmac('sha256', password.encode(), salt.encode(), cost).hex()
+        if kdf == 'scrypt':
+            return hashlib.scrypt(password.encode(), salt=salt.encode(), n=cost, r=PASSWORD_SCRYPT_R,
+                                  p=PASSWORD_SCRYPT_P, maxmem=256 * cost * PASSWORD_SCRYPT_R).hex()
+        raise ValueError(f"Unknown password KDF: {kdf}")
+
+    @staticmethod
+    def hash_password(password: str, kdf: Optional[str] = None, cost: Optional[int] = None) -> str:
+        """Hash password as "<kdf>$<cost>$<salt>:<hash>" (configured KDF by default)"""
+        kdf = kdf or PASSWORD_KDF
+        cost = cost or PASSWORD_KDF_COST
         salt = secrets.token_hex(16)
-        password_hash = hashlib.sha256((password + salt).encode()).hexdigest()
-        return f"{salt}:{password_hash}"
+        return f"{kdf}${cost}${salt}:{AuthManager.derive_key(password, salt, kdf, cost)}"
 
     @staticmethod
     def verify_password(password: str, password_hash: str) -> bool:
-        """Verify password against hash"""
+        """Verify password against hash
+
+        Hashes without a "<kdf>$<cost>$" prefix are legacy single-round SHA256.
+        """
         try:
-            salt, hash_value = password_hash.split(':')
-            return hashlib.sha256((password + salt).encode()).hexdigest() == hash_value
-        except:
+            if '$' in password_hash:
+                kdf, cost, salted = password_hash.split('$')
+                salt, hash_value = salted.split(':')
+                computed = AuthManager.derive_key(password, salt, kdf, int(cost))
+            else:
+                salt, hash_value = password_hash.split(':')
+                computed = hashlib.sha256((password + salt).encode()).hexdigest()
+            return hmac.compare_digest(computed, hash_value)
+        except ValueError:
             return False
 
     @staticmethod
-    def generate_tokens() -> Tuple[str, str]:
-        """Generate access and refresh tokens"""
+    def needs_rehash(password_hash: str) -> bool:
+        """True if the hash was made with another KDF or cost than configured now"""
+        return not password_hash.startswith(f"{PASSWORD_KDF}${PASSWORD_KDF_COST}$")
+
+    @staticmethod
+    def generate_tokens(user: Optional[User] = None, expires_at: Optional[datetime] = None) -> Tuple[str, str]:
+        """Generate access and refresh tokens
+
+        In signed mode the access token of a user carries the user's claims;
+        `user` may also be a row with the id, username and is_read_only columns.
+        """
         access_token = secrets.token_urlsafe(32)
+        if AUTH_TOKEN_MODE == 'signed' and user is not None:
+            access_token = AuthManager.sign_access_token(user, expires_at)
         refresh_token = secrets.token_urlsafe(32)
         return access_token, refresh_token
 
+    @staticmethod
+    def sign_access_token(user: User, expires_at: datetime) -> str:
+        """Build a "v1.<claims>.<signature>" token"""
+        claims = {
+            'uid': user.id,
+            'usr': user.username,
+            'ro': user.is_read_only,
+            'iat': time.time_ns() // 1_000_000,  # ms
+            'exp': int(expires_at.replace(tzinfo=timezone.utc).timestamp()),
+            'jti': secrets.token_urlsafe(12)
+        }
+        payload = base64.urlsafe_b64encode(json.dumps(claims, separators=(',', ':')).encode()).rstrip(b'=')
+        signature = base64.urlsafe_b64encode(hmac.digest(AUTH_TOKEN_SECRET, payload, 'sha256')).rstrip(b'=')
+        return f"v1.{payload.decode()}.{signature.decode()}"
+
+    @staticmethod
+    def decode_signed_token(token: str) -> Optional[Dict]:
+        """Claims of a correctly signed token, expired or not; None for other tokens"""
+        try:
+            version, payload, signature = token.split('.')
+            if version != 'v1':
+                return None
+            expected = base64.urlsafe_b64encode(hmac.digest(AUTH_TOKEN_SECRET, payload.encode(), 'sha256')).rstrip(b'=')
+            if not hmac.compare_digest(expected, signature.encode()):
+                return None
+            return json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+        except (ValueError, TypeError):
+            return None
+
+    @staticmethod
+    def verify_signed_token(token: str) -> Optional[Dict]:
+        """Verify a signed token without the database, return user info"""
+        claims = AuthManager.decode_signed_token(token)
+        if claims is None or claims['exp'] < time.time() or revoked_tokens.is_revoked(claims):
+            return None
+        return {
+            'user_id': claims['uid'],
+            'username': claims['usr'],
+            'is_read_only': claims['ro'],
+            'is_active': True
+        }
+
+    @staticmethod
+    def revoke_signed_token(token: str) -> bool:
+        """Put a signed token on the revocation list, False for other tokens"""
+        claims = AuthManager.decode_signed_token(token)
+        if claims is None:
+            return False
+        revoked_tokens.revoke_token(claims['jti'], claims['exp'])
+        return True
+
+    @staticmethod
+    async def arevoke_signed_token(token: str) -> bool:
+        """revoke_signed_token for the event loop"""
+        claims = AuthManager.decode_signed_token(token)
+        if claims is None:
+            return False
+        await revoked_tokens.arevoke_token(claims['jti'], claims['exp'])
+        return True
+
     def register_user(self, username: str, email: str, password: str, is_read_only: bool = False) -> Optional[Dict]:
         """Register new user"""
         session = self.Session()
@@ -528,10 +2253,12 @@ class AuthManager:
 
             if not self.verify_password(password, user.password_hash):
                 return None
+            if self.needs_rehash(user.password_hash):
+                user.password_hash = self.hash_password(password)
 
             # Generate tokens
-            access_token, refresh_token = self.generate_tokens()
-            expires_at = datetime.utcnow() + timedelta(hours=24)
+            expires_at = datetime.utcnow() + ACCESS_TOKEN_LIFETIME
+            access_token, refresh_token = self.generate_tokens(user, expires_at)
 
             # Create session
             db_session = Session(
@@ -556,28 +2283,29 @@ class AuthManager:
 
     def verify_token(self, token: str) -> Optional[Dict]:
         """Verify token and return user info"""
+        if AUTH_TOKEN_MODE == 'signed' and token.startswith('v1.'):
+            return AuthManager.verify_signed_token(token)
+
+        cached = token_cache.get(token)
+        if cached is not None:
+            return cached
+
         session = self.Session()
         try:
-            db_session = session.query(Session).filter(
-                (Session.token == token) & (Session.is_active == True)
+            row = session.execute(
+                self.TOKEN_USER_QUERY, {'token': token, 'now': datetime.utcnow()}
             ).first()
-
-            if not db_session:
-                return None
-
-            if db_session.expires_at < datetime.utcnow():
-                return None
-
-            user = session.query(User).filter(User.id == db_session.user_id).first()
-            if not user or not user.is_active:
+            if not row:
                 return None
 
-            return {
-                'user_id': user.id,
-                'username': user.username,
-                'is_read_only': user.is_read_only,
-                'is_active': user.is_active
+            user_info = {
+                'user_id': row.user_id,
+                'username': row.username,
+                'is_read_only': row.is_read_only,
+                'is_active': row.is_active
             }
+            token_cache.set(token, user_info, row.expires_at)
+            return user_info
         finally:
             session.close()
 
@@ -585,33 +2313,33 @@ class AuthManager:
         """Refresh access token using refresh token"""
         session = self.Session()
         try:
-            db_session = session.query(Session).filter(
-                (Session.refresh_token == refresh_token) & (Session.is_active == True)
-            ).first()
-
-            if not db_session:
-                return None
-
-            user = session.query(User).filter(User.id == db_session.user_id).first()
-            if not user or not user.is_active:
+            row = session.execute(self.REFRESH_SESSION_QUERY, {
+                'refresh_token': refresh_token, 'refresh_horizon': datetime.utcnow() - REFRESH_TOKEN_LIFETIME
+            }).first()
+            if not row:
                 return None
 
             # Generate new tokens
-            new_access_token, new_refresh_token = self.generate_tokens()
-            new_expires_at = datetime.utcnow() + timedelta(hours=24)
-
-            # Update session
-            db_session.token = new_access_token
-            db_session.refresh_token = new_refresh_token
-            db_session.expires_at = new_expires_at
+            new_expires_at = datetime.utcnow() + ACCESS_TOKEN_LIFETIME
+            new_access_token, new_refresh_token = self.generate_tokens(row, new_expires_at)
+
+            # Update session, the old access token stops working
+            result = session.execute(self.ROTATE_SESSION_STATEMENT, {
+                'session_id': row.session_id, 'old_refresh_token': refresh_token, 'new_token': new_access_token,
+                'new_refresh_token': new_refresh_token, 'new_expires_at': new_expires_at
+            })
+            if result.rowcount != 1:
+                return None
             session.commit()
+            token_cache.invalidate_token(row.token)
+            self.revoke_signed_token(row.token)
 
             return {
                 'access_token': new_access_token,
                 'refresh_token': new_refresh_token,
-                'user_id': user.id,
-                'username': user.username,
-                'is_read_only': user.is_read_only
+                'user_id': row.id,
+                'username': row.username,
+                'is_read_only': row.is_read_only
             }
         finally:
             session.close()
@@ -620,20 +2348,729 @@ class AuthManager:
         """Logout user by invalidating session"""
         session = self.Session()
         try:
-            db_session = session.query(Session).filter(Session.token == token).first()
+            # Signed tokens verify without the session row, revoke them anyway
+            revoked = self.revoke_signed_token(token)
+            db_session = session.query(Session).filter(
+                (Session.token == token) & (Session.is_active == True)
+            ).first()
             if not db_session:
-                return False
+                return revoked
 
             db_session.is_active = False
             session.commit()
+            token_cache.invalidate_token(token)
+            return True
+        finally:
+            session.close()
+
+    def set_user_active(self, user_id: int, is_active: bool) -> bool:
+        """Activate or deactivate user"""
+        session = self.Session()
+        try:
+            user = session.query(User).filter(User.id == user_id).first()
+            if not user:
+                return False
+
+            user.is_active = is_active
+            session.commit()
+            token_cache.invalidate_user(user_id)
+            if not is_active:
+                revoked_tokens.revoke_user(user_id)
             return True
         finally:
             session.close()
 
 
+def student_to_dict(student: Student) -> Dict:
+    """Convert Student model to API dict"""
+    return {
+        'id': student.id,
+        'last_name': student.last_name,
+        'first_name': student.first_name,
+        'faculty': student.faculty,
+        'course': student.course,
+        'score': student.score
+    }
+
+
+class AsyncStudentManager:
+    """Asyncio counterpart of StudentManager used by the API endpoints"""
+
+    def __init__(self, db_path=DATABASE_URL):
+        self.engine = get_async_engine(db_path)
+        self.Session = async_sessionmaker(self.engine, expire_on_commit=False)
+
+    async def get_students_by_faculty(self, faculty: str) -> List[Dict]:
+        async with self.Session() as session:
+            result = await session.execute(select(Student).where(Student.faculty == faculty))
+            return [student_to_dict(s) for s in result.scalars()]
+
+    async def get_unique_courses(self) -> List[str]:
+        async with self.Session() as session:
+            result = await session.execute(select(Student.course).distinct())
+            return list(result.scalars())
+
+    async def get_faculties(self) -> List[str]:
+        async with self.Session() as session:
+            result = await session.execute(select(Student.faculty).distinct())
+            return list(result.scalars())
+
+    async def get_average_score_by_faculty(self, faculty: str) -> float:
+        async with self.Session() as session:
+            result = await session.scalar(
+                select(func.avg(Student.score)).where(Student.faculty == faculty)
+            )
+            return result if result else 0.0
+
+    async def get_low_score_students_by_course(self, course: str, threshold: int = 30) -> List[Dict]:
+        async with self.Session() as session:
+            result = await session.execute(select(Student).where(
+                Student.course == course,
+                Student.score < threshold
+            ))
+            return [student_to_dict(s) for s in result.scalars()]
+
+    async def create_student(self, last_name: str, first_name: str, faculty: str, course: str, score: int) -> Dict:
+        """Create a new student record"""
+        async with self.Session() as session:
+            student = Student(
+                last_name=last_name,
+                first_name=first_name,
+                faculty=faculty,
+                course=course,
+                score=score
+            )
+            session.add(student)
+            await session.commit()
+            return student_to_dict(student)
+
+    async def get_student_by_id(self, student_id: int) -> Optional[Dict]:
+        """Get student by ID"""
+        async with self.Session() as session:
+            student = await session.get(Student, student_id)
+            return student_to_dict(student) if student else None
+
+    async def count_students(self) -> int:
+        """Get number of students"""
+        async with self.Session() as session:
+            return await session.scalar(select(func.count(Student.id)))
+
+    async def get_students_page(self, limit: int = DEFAULT_PAGE_SIZE, after: Optional[int] = None) -> List[Dict]:
+        """Get up to `limit` students with id greater than `after` (keyset pagination)"""
+        stmt = select(Student).order_by(Student.id).limit(limit)
+        if after is not None:
+            stmt = stmt.where(Student.id > after)
+        async with self.Session() as session:
+            result = await session.execute(stmt)
+            return [student_to_dict(s) for s in result.scalars()]
+
+    async def iter_students(self, after: Optional[int] = None,
+                            batch_size: int = STREAM_BATCH_SIZE) -> AsyncIterator[Dict]:
+        """Yield students in id order from a server-side cursor"""
+        stmt = select(Student.__table__).order_by(Student.id)
+        if after is not None:
+            stmt = stmt.where(Student.id > after)
+        async with self.engine.connect() as conn:
+            result = await conn.stream(stmt.execution_options(yield_per=batch_size))
+            async for row in result:
+                yield dict(row._mapping)
+
+    async def update_student(self, student_id: int, **kwargs) -> Optional[Tuple[Dict, Dict]]:
+        """Update student record, return its (previous, updated) versions"""
+        async with self.Session() as session:
+            student = await session.get(Student, student_id)
+            if not student:
+                return None
+
+            previous = student_to_dict(student)
+            for key, value in kwargs.items():
+                if value is not None and hasattr(student, key):
+                    setattr(student, key, value)
+
+            await session.commit()
+            return previous, student_to_dict(student)
+
+    async def delete_student(self, student_id: int) -> Optional[Dict]:
+        """Delete student record, return the deleted row"""
+        async with self.Session() as session:
+            student = await session.get(Student, student_id)
+            if not student:
+                return None
+            deleted = student_to_dict(student)
+            await session.delete(student)
+            await session.commit()
+            return deleted
+
+
+class AsyncAuthManager:
+    """Asyncio counterpart of AuthManager used by the API endpoints"""
+
+    def __init__(self, db_path=DATABASE_URL):
+        self.engine = get_async_engine(db_path)
+        self.Session = async_sessionmaker(self.engine, expire_on_commit=False)
+
+    async def register_user(self, username: str, email: str, password: str, is_read_only: bool = False) -> Optional[Dict]:
+        """Register new user
+
+        Raises PasswordHashingBusy when the hashing pool is saturated.
+        """
+        async with self.Session() as session:
+            # Check if user exists before spending a hashing slot
+            existing = await session.scalar(select(User.id).where(
+                (User.username == username) | (User.email == email)
+            ).limit(1))
+        if existing:
+            return None
+
+        password_hash = await password_hasher.run(AuthManager.hash_password, password)
+        async with self.Session() as session:
+            # Create new user; a concurrent registration of the same
+            # username or email fails on the unique constraints
+            user = User(
+                username=username,
+                email=email,
+                password_hash=password_hash,
+                is_read_only=is_read_only,
+                is_active=True
+            )
+            session.add(user)
+            try:
+                await session.commit()
+            except IntegrityError:
+                return None
+
+            return {
+                'id': user.id,
+                'username': user.username,
+                'email': user.email,
+                'is_read_only': user.is_read_only,
+                'is_active': user.is_active,
+                'created_at': user.created_at
+            }
+
+    async def login_user(self, username: str, password: str) -> Optional[Dict]:
+        """Authenticate user and create session
+
+        The password is checked in the hashing pool without holding a database
+        connection. Raises PasswordHashingBusy when the pool is saturated.
+        """
+        async with self.Session() as session:
+            user = await session.scalar(select(User).where(User.username == username).limit(1))
+        if not user or not user.is_active:
+            return None
+
+        if not await password_hasher.run(AuthManager.verify_password, password, user.password_hash):
+            return None
+        new_hash = None
+        if AuthManager.needs_rehash(user.password_hash):
+            try:
+                new_hash = await password_hasher.run(AuthManager.hash_password, password)
+            except PasswordHashingBusy:
+                pass  # upgrade the hash on a later login
+
+        # Generate tokens
+        expires_at = datetime.utcnow() + ACCESS_TOKEN_LIFETIME
+        access_token, refresh_token = AuthManager.generate_tokens(user, expires_at)
+
+        async with self.Session() as session:
+            # Create session
+            session.add(Session(
+                user_id=user.id,
+                token=access_token,
+                refresh_token=refresh_token,
+                expires_at=expires_at,
+                is_active=True
+            ))
+            if new_hash:
+                await session.execute(update(User).where(User.id == user.id).values(password_hash=new_hash))
+            await session.commit()
+
+        return {
+            'access_token': access_token,
+            'refresh_token': refresh_token,
+            'user_id': user.id,
+            'username': user.username,
+            'is_read_only': user.is_read_only
+        }
+
+    async def verify_token(self, token: str) -> Optional[Dict]:
+        """Verify token and return user info"""
+        if AUTH_TOKEN_MODE == 'signed' and token.startswith('v1.'):
+            return AuthManager.verify_signed_token(token)
+
+        cached = token_cache.get(token)
+        if cached is not None:
+            return cached
+
+        async with self.Session() as session:
+            row = (await session.execute(
+                AuthManager.TOKEN_USER_QUERY, {'token': token, 'now': datetime.utcnow()}
+            )).first()
+        if not row:
+            return None
+
+        user_info = {
+            'user_id': row.user_id,
+            'username': row.username,
+            'is_read_only': row.is_read_only,
+            'is_active': row.is_active
+        }
+        token_cache.set(token, user_info, row.expires_at)
+        return user_info
+
+    async def refresh_token_user(self, refresh_token: str) -> Optional[Dict]:
+        """Refresh access token using refresh token"""
+        async with self.Session() as session:
+            row = (await session.execute(
+                AuthManager.REFRESH_SESSION_QUERY,
+                {'refresh_token': refresh_token, 'refresh_horizon': datetime.utcnow() - REFRESH_TOKEN_LIFETIME}
+            )).first()
+            if not row:
+                return None
+
+            # Generate new tokens
+            new_expires_at = datetime.utcnow() + ACCESS_TOKEN_LIFETIME
+            new_access_token, new_refresh_token = AuthManager.generate_tokens(row, new_expires_at)
+
+            # Update session, the old access token stops working
+            result = await session.execute(AuthManager.ROTATE_SESSION_STATEMENT, {
+                'session_id': row.session_id, 'old_refresh_token': refresh_token, 'new_token': new_access_token,
+                'new_refresh_token': new_refresh_token, 'new_expires_at': new_expires_at
+            })
+            if result.rowcount != 1:
+                return None
+            await session.commit()
+        await token_cache.ainvalidate_token(row.token)
+        await AuthManager.arevoke_signed_token(row.token)
+
+        return {
+            'access_token': new_access_token,
+            'refresh_token': new_refresh_token,
+            'user_id': row.id,
+            'username': row.username,
+            'is_read_only': row.is_read_only
+        }
+
+    async def logout_user(self, token: str) -> bool:
+        """Logout user by invalidating session"""
+        async with self.Session() as session:
+            # Signed tokens verify without the session row, revoke them anyway
+            revoked = await AuthManager.arevoke_signed_token(token)
+            db_session = await session.scalar(select(Session).where(
+                (Session.token == token) & (Session.is_active == True)
+            ).limit(1))
+            if not db_session:
+                return revoked
+
+            db_session.is_active = False
+            await session.commit()
+            await token_cache.ainvalidate_token(token)
+            return True
+
+    async def set_user_active(self, user_id: int, is_active: bool) -> bool:
+        """Activate or deactivate user"""
+        async with self.Session() as session:
+            user = await session.get(User, user_id)
+            if not user:
+                return False
+
+            user.is_active = is_active
+            await session.commit()
+            await token_cache.ainvalidate_user(user_id)
+            if not is_active:
+                await revoked_tokens.arevoke_user(user_id)
+            return True
+
+
 # Initialize managers as global variables
 manager = StudentManager()
 auth_manager = AuthManager()
+# Endpoints use the asyncio managers, background tasks the sync ones
+async_manager = AsyncStudentManager()
+async_auth_manager = AsyncAuthManager()
+
+
+class StudentIdFilter:
+    """Bloom filter of existing student IDs, rejects lookups of unknown IDs without a query
+
+    IDs above the largest ID at build time are never rejected, so students
+    created later are found even before this worker hears about them.
+    Created IDs are added anyway (from the invalidation of their namespace)
+    because SQLite may reuse IDs below that watermark. Bulk jobs make the
+    filter stale; it answers "maybe" until the rebuild is done.
+    """
+
+    def __init__(self, student_manager: StudentManager, error_rate: float = STUDENT_BLOOM_ERROR_RATE):
+        self.manager = student_manager
+        self.error_rate = error_rate
+        self.bloom: Optional[BloomFilter] = None
+        self.watermark = 0
+        self.built_at: Optional[str] = None
+        self.rejected = 0
+        self._stale = True
+        self._added_during_build: Optional[List[int]] = None
+        self._task: Optional[asyncio.Task] = None
+        self._lock = threading.Lock()
+
+    def might_exist(self, student_id: int) -> bool:
+        """False only if the student certainly does not exist"""
+        bloom = self.bloom
+        if bloom is None or self._stale or student_id > self.watermark or student_id in bloom:
+            return True
+        self.rejected += 1
+        return False
+
+    def add(self, student_id: int) -> None:
+        """Add ID of a created student"""
+        with self._lock:
+            if self._added_during_build is not None:
+                self._added_during_build.append(student_id)
+            if self.bloom is not None:
+                self.bloom.add(student_id)
+
+    def on_invalidate(self, namespaces: List[str]) -> None:
+        """Invalidation hook: learn created IDs, go stale after bulk jobs"""
+        for namespace in namespaces:
+            if namespace == CacheManager.GLOBAL_NAMESPACE:
+                self._stale = True
+            elif namespace.startswith("student:"):
+                self.add(int(namespace.split(":", 1)[1]))
+
+    def build(self) -> None:
+        """Read all student IDs into a new filter, blocking"""
+        with self._lock:
+            self._stale = False  # a bulk job finishing meanwhile makes it stale again
+            self._added_during_build = []
+        try:
+            with self.manager.engine.connect() as conn:
+                count, max_id = conn.execute(select(func.count(), func.max(Student.id))).one()
+                # Leave room for students created until the next rebuild
+                bloom = BloomFilter(count + count // 4 + 1024, self.error_rate)
+                ids = conn.execution_options(stream_results=True, yield_per=STREAM_BATCH_SIZE).execute(select(Student.id))
+                for (student_id,) in ids:
+                    bloom.add(student_id)
+            with self._lock:
+                for student_id in self._added_during_build:
+                    bloom.add(student_id)
+                self.bloom, self.watermark = bloom, max_id or 0
+                self.built_at = datetime.utcnow().isoformat()
+        except Exception:
+            self._stale = True
+            raise
+        finally:
+            with self._lock:
+                self._added_during_build = None
+
+    def refresh_if_stale(self) -> None:
+        """Rebuild the filter in a thread if it is stale and no rebuild is running"""
+        if self._stale and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(asyncio.to_thread(self.build))
+            self._task.add_done_callback(self._on_build_done)
+
+    @staticmethod
+    def _on_build_done(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            print(f"Student ID filter build error: {task.exception()}")
+
+    def stats(self) -> Dict:
+        """Filter size and number of lookups it rejected"""
+        bloom = self.bloom
+        return {
+            "ready": bloom is not None and not self._stale,
+            "watermark": self.watermark,
+            "bits": bloom.size if bloom else 0,
+            "hashes": bloom.hashes if bloom else 0,
+            "built_at": self.built_at,
+            "rejected": self.rejected
+        }
+
+
+student_id_filter = StudentIdFilter(manager)
+CacheManager.invalidation_hooks.append(student_id_filter.on_invalidate)
+
+
+# Cached queries, shared by the endpoints and the cache warmer
+
+async def load_students_page(limit: int = DEFAULT_PAGE_SIZE, after: Optional[int] = None) -> CacheEntry:
+    """Page of students ordered by ID, with the cursor of the next page"""
+    def next_cursor(page: List[Dict]) -> Dict[str, str]:
+        return {"X-Next-Cursor": str(page[-1]['id'])} if len(page) == limit else {}
+
+    cache_key = await AsyncCacheManager.make_cache_key("students:page", {"limit": limit, "after": after}, ("students:list",))
+    return await AsyncCacheManager.get_or_compute(cache_key, lambda: async_manager.get_students_page(limit, after),
+                                                  policy="students:page", adapter=STUDENT_LIST_ADAPTER,
+                                                  headers=next_cursor)
+
+
+async def load_student(student_id: int) -> Optional[CacheEntry]:
+    """Student by ID, None if there is no such student
+
+    Misses are cached too, so repeated lookups of a missing ID do not reach
+    the database; IDs rejected by the Bloom filter do not even reach Redis.
+    """
+    student_id_filter.refresh_if_stale()
+    if not student_id_filter.might_exist(student_id):
+        return None
+    cache_key = await AsyncCacheManager.make_cache_key("students:by_id", {"id": student_id}, (f"student:{student_id}",))
+    return await AsyncCacheManager.get_or_compute(cache_key, lambda: async_manager.get_student_by_id(student_id),
+                                                  policy="students:by_id", adapter=STUDENT_ADAPTER,
+                                                  cache_missing=True)
+
+
+async def load_students_by_faculty(faculty: str) -> CacheEntry:
+    """Students of a faculty"""
+    cache_key = await AsyncCacheManager.make_cache_key("students:by_faculty", {"faculty": faculty}, (f"faculty:{faculty}",))
+    return await AsyncCacheManager.get_or_compute(cache_key, lambda: async_manager.get_students_by_faculty(faculty),
+                                                  policy="students:by_faculty", adapter=STUDENT_LIST_ADAPTER)
+
+
+async def load_unique_courses() -> CacheEntry:
+    """Unique course names"""
+    cache_key = await AsyncCacheManager.make_cache_key("courses:unique", namespaces=("courses",))
+    return await AsyncCacheManager.get_or_compute(cache_key, async_manager.get_unique_courses,
+                                                  policy="courses:unique", adapter=COURSE_LIST_ADAPTER)
+
+
+async def load_average_score(faculty: str) -> CacheEntry:
+    """Average score of a faculty"""
+    cache_key = await AsyncCacheManager.make_cache_key("faculty:avg_score", {"faculty": faculty}, (f"faculty:{faculty}",))
+
+    async def compute():
+        return {"faculty": faculty, "average_score": await async_manager.get_average_score_by_faculty(faculty)}
+
+    return await AsyncCacheManager.get_or_compute(cache_key, compute, policy="faculty:avg_score")
+
+
+async def load_low_score_students(course: str, threshold: int = 30) -> CacheEntry:
+    """Students of a course with a score below threshold"""
+    cache_key = await AsyncCacheManager.make_cache_key("students:low_scores", {"course": course, "threshold": threshold}, (f"course:{course}",))
+    return await AsyncCacheManager.get_or_compute(
+        cache_key, lambda: async_manager.get_low_score_students_by_course(course, threshold),
+        policy="students:low_scores", adapter=STUDENT_LIST_ADAPTER
+    )
+
+
+class CacheWarmer:
+    """Precompute hot cache keys in the background, throttled against database load"""
+
+    def __init__(self, student_manager: AsyncStudentManager, rate: float = CACHE_WARM_RATE,
+                 db_share: float = CACHE_WARM_DB_SHARE):
+        self.manager = student_manager
+        self.rate = rate
+        self.db_share = db_share
+        self.last_run: Optional[Dict] = None
+        self._task: Optional[asyncio.Task] = None
+        self._pending: Optional[str] = None  # trigger of a run requested while warming
+
+    async def hot_loaders(self) -> AsyncIterator[Callable[[], Awaitable[Any]]]:
+        """Loaders of the keys requested right after a deploy or a bulk job"""
+        yield load_students_page
+        yield load_unique_courses
+        for faculty in await self.manager.get_faculties():
+            yield partial(load_students_by_faculty, faculty)
+            yield partial(load_average_score, faculty)
+        for course in json.loads((await load_unique_courses()).body):
+            for threshold in CACHE_WARM_THRESHOLDS:
+                yield partial(load_low_score_students, course, threshold)
+
+    async def wait_for_idle_pool(self) -> None:
+        """Wait while the endpoints hold half of the database connections or more"""
+        pool = self.manager.engine.sync_engine.pool
+        while isinstance(pool, QueuePool) and pool.checkedout() >= max(1, pool.size() // 2):
+            await asyncio.sleep(0.1)
+
+    async def warm(self, trigger: str = "manual") -> Dict:
+        """Make sure every hot key is cached, return how many keys were computed"""
+        started = time.perf_counter()
+        keys = 0
+        db_seconds = 0.0
+        computed = []
+        token = AsyncCacheManager.computed_keys.set(computed)
+        try:
+            async for loader in self.hot_loaders():
+                await self.wait_for_idle_pool()
+                computed_before = len(computed)
+                load_started = time.perf_counter()
+                await loader()
+                elapsed = time.perf_counter() - load_started
+                keys += 1
+                pause = 1 / self.rate
+                if len(computed) > computed_before:
+                    # Stay idle long enough to use at most db_share of the database time
+                    db_seconds += elapsed
+                    pause = max(pause, elapsed * (1 / self.db_share - 1))
+                await asyncio.sleep(pause)
+        finally:
+            AsyncCacheManager.computed_keys.reset(token)
+
+        self.last_run = {
+            "trigger": trigger,
+            "keys": keys,
+            "warmed": len(computed),
+            "db_seconds": round(db_seconds, 3),
+            "elapsed_seconds": round(time.perf_counter() - started, 3),
+            "finished_at": datetime.utcnow().isoformat()
+        }
+        print(f"Cache warmer ({trigger}): warmed {len(computed)} of {keys} hot keys "
+              f"in {self.last_run['elapsed_seconds']} s")
+        return self.last_run
+
+    async def schedule(self, trigger: str) -> None:
+        """Start warming in the background; a request during a run starts one more run after it"""
+        if not REDIS_AVAILABLE:
+            return
+        if self._task is not None and not self._task.done():
+            self._pending = trigger
+            return
+        self._task = asyncio.create_task(self._run(trigger))
+
+    async def _run(self, trigger: str) -> None:
+        while trigger:
+            try:
+                await self.warm(trigger)
+            except Exception as e:
+                print(f"Cache warmer error: {e}")
+            trigger, self._pending = self._pending, None
+
+    def stats(self) -> Dict:
+        """Whether the warmer is running and the report of its last run"""
+        return {"running": self._task is not None and not self._task.done(), "last_run": self.last_run}
+
+
+cache_warmer = CacheWarmer(async_manager)
+
+
+class SessionSweeper:
+    """Periodically delete expired and logged out sessions in small batches"""
+
+    LOCK_KEY = "sessions:sweep"
+
+    def __init__(self, engine: Engine, interval: float = SESSION_SWEEP_INTERVAL,
+                 batch_size: int = SESSION_SWEEP_BATCH):
+        self.engine = engine
+        self.interval = interval
+        self.batch_size = batch_size
+        self.total_deleted = 0
+        self.last_run: Optional[Dict] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def sweep(self, now: Optional[datetime] = None) -> Dict:
+        """Delete expired and inactive sessions, one short transaction per batch
+
+        Expired sessions are kept while their refresh token is still valid.
+        """
+        started = time.perf_counter()
+        now = now or datetime.utcnow()
+        deleted = {}
+        refresh_horizon = now - REFRESH_TOKEN_LIFETIME
+        for reason, condition in (('expired', Session.expires_at < refresh_horizon),
+                                  ('inactive', Session.is_active == False)):
+            deleted[reason] = 0
+            while True:
+                batch = select(Session.id).where(condition).limit(self.batch_size).scalar_subquery()
+                with self.engine.begin() as conn:
+                    count = conn.execute(delete(Session).where(Session.id.in_(batch))).rowcount
+                deleted[reason] += count
+                if count < self.batch_size:
+                    break
+                time.sleep(SESSION_SWEEP_PAUSE)
+
+        self.total_deleted += sum(deleted.values())
+        self.last_run = {
+            "deleted": deleted,
+            "elapsed_seconds": round(time.perf_counter() - started, 3),
+            "finished_at": datetime.utcnow().isoformat(),
+            **self.table_size()
+        }
+        print(f"Session sweeper: deleted {deleted['expired']} expired and {deleted['inactive']} "
+              f"inactive sessions in {self.last_run['elapsed_seconds']} s")
+        return self.last_run
+
+    def table_size(self) -> Dict:
+        """Rows left in the sessions table and bytes used by it and its indexes"""
+        with self.engine.connect() as conn:
+            rows = conn.scalar(select(func.count()).select_from(Session))
+            try:
+                # dbstat is optional in SQLite builds
+                size = conn.scalar(text(
+                    "SELECT SUM(pgsize) FROM dbstat WHERE name = 'sessions' "
+                    "OR name IN (SELECT name FROM sqlite_master WHERE tbl_name = 'sessions')"
+                ))
+            except OperationalError:
+                size = None
+        return {"rows": rows, "table_bytes": size}
+
+    def claim_turn(self) -> bool:
+        """Whether this worker sweeps now; the others skip the interval"""
+        if not REDIS_AVAILABLE:
+            return True
+        try:
+            return bool(redis_client.set(self.LOCK_KEY, os.getpid(), nx=True, ex=max(1, int(self.interval * 0.9))))
+        except redis.RedisError:
+            return True
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                if await asyncio.to_thread(self.claim_turn):
+                    await asyncio.to_thread(self.sweep)
+            except Exception as e:
+                print(f"Session sweeper error: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Start sweeping in the background of the running event loop"""
+        if self.interval > 0 and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        """Cancel the background sweeps"""
+        if self._task is not None:
+            self._task.cancel()
+
+    def stats(self) -> Dict:
+        """Sweep interval, rows deleted so far and the report of the last sweep"""
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "interval_seconds": self.interval,
+            "total_deleted": self.total_deleted,
+            "last_run": self.last_run
+        }
+
+
+session_sweeper = SessionSweeper(engine)
+
+
+@app.on_event("startup")
+def start_cache_listener():
+    """Start receiving cache invalidations, token cache evictions and token revocations of the other workers"""
+    CacheManager.start_invalidation_listener()
+    revoked_tokens.start()
+    token_cache.start()
+
+
+@app.on_event("startup")
+async def warm_cache_on_startup():
+    """Build the student ID filter and precompute hot cache keys after a deploy"""
+    student_id_filter.refresh_if_stale()
+    if CACHE_WARM_ON_STARTUP:
+        await cache_warmer.schedule("startup")
+
+
+@app.on_event("startup")
+async def start_session_sweeper():
+    """Delete expired and logged out sessions periodically"""
+    session_sweeper.start()
+
+
+@app.on_event("shutdown")
+async def stop_cache_listener():
+    """Stop the pub/sub subscribers and the session sweeper, close Redis connections"""
+    CacheManager.stop_invalidation_listener()
+    revoked_tokens.stop()
+    token_cache.stop()
+    session_sweeper.stop()
+    await async_redis_client.aclose()
 
 
 # Dependency for authentication
@@ -649,14 +3086,14 @@ async def get_current_user(authorization: str = Header(None)) -> AuthUser:
     except ValueError:
         raise HTTPException(status_code=401, detail="Invalid authorization header")
 
-    user_info = auth_manager.verify_token(token)
+    user_info = await async_auth_manager.verify_token(token)
     if not user_info:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
 
     return AuthUser(**user_info)
 
 
-def check_read_only(user: AuthUser = Depends(get_current_user)) -> AuthUser:
+async def check_read_only(user: AuthUser = Depends(get_current_user)) -> AuthUser:
     """Ensure user has write permissions"""
     if user.is_read_only:
         raise HTTPException(status_code=403, detail="User has read-only access")
@@ -666,46 +3103,56 @@ def check_read_only(user: AuthUser = Depends(get_current_user)) -> AuthUser:
 # Authentication Endpoints
 
 @app.post("/auth/register", response_model=UserResponse, tags=["Authentication"])
-def register(user_data: UserRegister):
+async def register(user_data: UserRegister, request: Request):
     """Register new user"""
-    result = auth_manager.register_user(
-        username=user_data.username,
-        email=user_data.email,
-        password=user_data.password,
-        is_read_only=user_data.is_read_only
-    )
+    await enforce_login_rate_limit("register", user_data.username, request)
+    try:
+        result = await async_auth_manager.register_user(
+            username=user_data.username,
+            email=user_data.email,
+            password=user_data.password,
+            is_read_only=user_data.is_read_only
+        )
+    except PasswordHashingBusy:
+        raise HTTPException(status_code=429, detail="Too many concurrent requests, retry later",
+                            headers={"Retry-After": "1"})
     if not result:
         raise HTTPException(status_code=400, detail="Username or email already exists")
     return result
 
 
 @app.post("/auth/login", response_model=TokenResponse, tags=["Authentication"])
-def login(user_data: UserLogin):
+async def login(user_data: UserLogin, request: Request):
     """Login user and return tokens"""
-    result = auth_manager.login_user(
-        username=user_data.username,
-        password=user_data.password
-    )
+    await enforce_login_rate_limit("login", user_data.username, request)
+    try:
+        result = await async_auth_manager.login_user(
+            username=user_data.username,
+            password=user_data.password
+        )
+    except PasswordHashingBusy:
+        raise HTTPException(status_code=429, detail="Too many concurrent logins, retry later",
+                            headers={"Retry-After": "1"})
     if not result:
         raise HTTPException(status_code=401, detail="Invalid username or password")
     return result
 
 
 @app.post("/auth/refresh", response_model=TokenResponse, tags=["Authentication"])
-def refresh_token(refresh_token: str):
+async def refresh_token(refresh_token: str):
     """Refresh access token using refresh token"""
-    result = auth_manager.refresh_token_user(refresh_token)
+    result = await async_auth_manager.refresh_token_user(refresh_token)
     if not result:
         raise HTTPException(status_code=401, detail="Invalid refresh token")
     return result
 
 
 @app.post("/auth/logout", tags=["Authentication"])
-def logout(user: AuthUser = Depends(get_current_user), authorization: str = Header(None)):
+async def logout(user: AuthUser = Depends(get_current_user), authorization: str = Header(None)):
     """Logout user and invalidate session"""
     try:
         scheme, token = authorization.split()
-        success = auth_manager.logout_user(token)
+        success = await async_auth_manager.logout_user(token)
         if not success:
             raise HTTPException(status_code=400, detail="Logout failed")
         return {"message": "Logged out successfully"}
@@ -717,53 +3164,69 @@ def logout(user: AuthUser = Depends(get_current_user), authorization: str = Head
 
 # CREATE - Add new student
 @app.post("/students", response_model=StudentResponse, tags=["CRUD"])
-def create_student(student: StudentCreate, user: AuthUser = Depends(check_read_only)):
+async def create_student(student: StudentCreate, user: AuthUser = Depends(check_read_only)):
     """Create a new student (requires authentication and write access)"""
-    result = manager.create_student(
+    result = await async_manager.create_student(
         last_name=student.last_name,
         first_name=student.first_name,
         faculty=student.faculty,
         course=student.course,
         score=student.score
     )
-    # Invalidate cache after creating a student
-    CacheManager.invalidate_pattern("cache:students*")
+    # Invalidate cache entries of the student's faculty and course
+    await AsyncCacheManager.invalidate(*CacheManager.student_namespaces(result))
     return result
 
 
+async def ndjson_lines(rows: AsyncIterator[Dict], batch_size: int = STREAM_BATCH_SIZE) -> AsyncIterator[str]:
+    """Encode rows as newline-delimited JSON, a batch of lines per chunk"""
+    batch = []
+    async for row in rows:
+        batch.append(json.dumps(row, ensure_ascii=False) + '\n')
+        if len(batch) >= batch_size:
+            yield ''.join(batch)
+            batch = []
+    if batch:
+        yield ''.join(batch)
+
+
 # READ - Get all students
 @app.get("/students", response_model=List[StudentResponse], tags=["CRUD"])
-def get_all_students(user: AuthUser = Depends(get_current_user)):
-    """Get all students (requires authentication)"""
-    cache_key = CacheManager.make_cache_key("students:all")
-    cached = CacheManager.get(cache_key)
-    if cached is not None:
-        return cached
-    result = manager.get_all_students()
-    CacheManager.set(cache_key, result)
-    return result
+async def get_all_students(limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                           after: Optional[int] = None,
+                           stream: bool = False,
+                           user: AuthUser = Depends(get_current_user)):
+    """
+    Get students ordered by ID, one page at a time (requires authentication)
+
+    Parameters:
+    - limit: Page size
+    - after: Return students with ID greater than this cursor
+    - stream: Stream all students after the cursor as NDJSON instead of a page
+
+    The cursor for the next page is returned in the X-Next-Cursor header
+    """
+    if stream:
+        return StreamingResponse(ndjson_lines(async_manager.iter_students(after)), media_type="application/x-ndjson")
+
+    return (await load_students_page(limit, after)).to_response()
 
 
 # READ - Get student by ID
 @app.get("/students/{student_id}", response_model=StudentResponse, tags=["CRUD"])
-def get_student(student_id: int, user: AuthUser = Depends(get_current_user)):
+async def get_student(student_id: int, user: AuthUser = Depends(get_current_user)):
     """Get a specific student by ID (requires authentication)"""
-    cache_key = CacheManager.make_cache_key("students:by_id", {"id": student_id})
-    cached = CacheManager.get(cache_key)
-    if cached is not None and len(cached) > 0:
-        return cached[0]
-    student = manager.get_student_by_id(student_id)
-    if not student:
+    entry = await load_student(student_id)
+    if entry is None:
         raise HTTPException(status_code=404, detail="Student not found")
-    CacheManager.set(cache_key, [student])
-    return student
+    return entry.to_response()
 
 
 # UPDATE - Update student
 @app.put("/students/{student_id}", response_model=StudentResponse, tags=["CRUD"])
-def update_student(student_id: int, student_update: StudentUpdate, user: AuthUser = Depends(check_read_only)):
+async def update_student(student_id: int, student_update: StudentUpdate, user: AuthUser = Depends(check_read_only)):
     """Update a student (requires authentication and write access)"""
-    result = manager.update_student(
+    result = await async_manager.update_student(
         student_id,
         last_name=student_update.last_name,
         first_name=student_update.first_name,
@@ -773,41 +3236,65 @@ def update_student(student_id: int, student_update: StudentUpdate, user: AuthUse
     )
     if not result:
         raise HTTPException(status_code=404, detail="Student not found")
-    # Invalidate related caches
-    CacheManager.invalidate_pattern("cache:students*")
-    return result
+    previous, updated = result
+    # Invalidate caches of the old and new faculty/course of the student
+    await AsyncCacheManager.invalidate(*CacheManager.student_namespaces(
+        previous, updated, courses_changed=previous['course'] != updated['course']
+    ))
+    return updated
 
 
 # DELETE - Delete student
 @app.delete("/students/{student_id}", tags=["CRUD"])
-def delete_student(student_id: int, user: AuthUser = Depends(check_read_only)):
+async def delete_student(student_id: int, user: AuthUser = Depends(check_read_only)):
     """Delete a student (requires authentication and write access)"""
-    success = manager.delete_student(student_id)
-    if not success:
+    deleted = await async_manager.delete_student(student_id)
+    if not deleted:
         raise HTTPException(status_code=404, detail="Student not found")
-    # Invalidate related caches
-    CacheManager.invalidate_pattern("cache:students*")
+    # Invalidate cache entries of the student's faculty and course
+    await AsyncCacheManager.invalidate(*CacheManager.student_namespaces(deleted))
     return {"message": "Student deleted successfully"}
 
 
 # Background Task Endpoints
 
 @app.post("/students/import-csv", tags=["Background Tasks"])
-def import_csv_background(csv_file: str, background_tasks: BackgroundTasks, user: AuthUser = Depends(check_read_only)):
+def import_csv_background(csv_file: str, background_tasks: BackgroundTasks, restart: bool = False,
+                          user: AuthUser = Depends(check_read_only)):
     """
     Import student records from CSV file as background task
 
     Parameters:
     - csv_file: Path to CSV file (e.g., 'students.csv')
+    - restart: Ignore the checkpoint of an interrupted import and start from the beginning
+
+    Rows are committed in chunks. Large files are parsed by a process pool so
+    the API workers are not busy with parsing. Re-submitting a file whose
+    import was interrupted resumes from the last committed chunk. A file that
+    is still being imported is rejected with 409.
 
     Returns task status immediately, processing happens in background
     """
-    background_tasks.add_task(manager.populate_from_csv_background, csv_file)
-    return {
+    if manager.is_import_running(csv_file):
+        raise HTTPException(status_code=409, detail=f"Import of {csv_file} is already running")
+    checkpoint = None
+    if not restart:
+        try:
+            checkpoint = manager.get_import_checkpoint(csv_file)
+        except OSError:
+            pass  # missing, unreadable or not a file, reported by the background task
+    background_tasks.add_task(manager.populate_from_csv_background, csv_file, restart)
+    background_tasks.add_task(cache_warmer.schedule, "import-csv")
+    response = {
         "status": "processing",
         "message": f"CSV import started for file: {csv_file}",
         "csv_file": csv_file
     }
+    if checkpoint:
+        response["message"] = f"CSV import resumed for file: {csv_file}"
+        response["resume_from_offset"] = checkpoint['byte_offset']
+        response["rows_already_imported"] = checkpoint['rows_imported']
+    return response
 
 
 class BulkDeleteRequest(BaseModel):
@@ -829,6 +3316,7 @@ def delete_students_bulk(request: BulkDeleteRequest, background_tasks: Backgroun
         raise HTTPException(status_code=400, detail="student_ids list cannot be empty")
 
     background_tasks.add_task(manager.delete_students_by_ids, request.student_ids)
+    background_tasks.add_task(cache_warmer.schedule, "bulk-delete")
     return {
         "status": "processing",
         "message": f"Bulk delete started for {len(request.student_ids)} students",
@@ -840,56 +3328,58 @@ def delete_students_bulk(request: BulkDeleteRequest, background_tasks: Backgroun
 
 # GET students by faculty
 @app.get("/students/faculty/{faculty}", response_model=List[StudentResponse], tags=["Queries"])
-def get_students_by_faculty(faculty: str, _: AuthUser = Depends(get_current_user)):
+async def get_students_by_faculty(faculty: str, _: AuthUser = Depends(get_current_user)):
     """Get all students from a specific faculty (requires authentication)"""
-    cache_key = CacheManager.make_cache_key("students:by_faculty", {"faculty": faculty})
-    cached = CacheManager.get(cache_key)
-    if cached is not None:
-        return cached
-    result = manager.get_students_by_faculty(faculty)
-    CacheManager.set(cache_key, result)
-    return result
+    return (await load_students_by_faculty(faculty)).to_response()
 
 
 # GET unique courses
 @app.get("/courses/unique", response_model=List[str], tags=["Queries"])
-def get_unique_courses(_: AuthUser = Depends(get_current_user)):
+async def get_unique_courses(_: AuthUser = Depends(get_current_user)):
     """Get list of all unique courses (requires authentication)"""
-    cache_key = CacheManager.make_cache_key("courses:unique")
-    cached = CacheManager.get(cache_key)
-    if cached is not None:
-        return cached
-    result = manager.get_unique_courses()
-    # Store as dict list for consistency
-    CacheManager.set(cache_key, [{"course": c} for c in result])
-    return result
+    return (await load_unique_courses()).to_response()
 
 
 # GET average score by faculty
 @app.get("/faculty/{faculty}/average-score", tags=["Queries"])
-def get_average_score(faculty: str, _: AuthUser = Depends(get_current_user)):
+async def get_average_score(faculty: str, _: AuthUser = Depends(get_current_user)):
     """Get average score for a faculty (requires authentication)"""
-    cache_key = CacheManager.make_cache_key("faculty:avg_score", {"faculty": faculty})
-    cached = CacheManager.get(cache_key)
-    if cached is not None:
-        return cached[0]
-    avg_score = manager.get_average_score_by_faculty(faculty)
-    result = {"faculty": faculty, "average_score": avg_score}
-    CacheManager.set(cache_key, [result])
-    return result
+    return (await load_average_score(faculty)).to_response()
 
 
 # GET low score students by course
 @app.get("/courses/{course}/low-scores", response_model=List[StudentResponse], tags=["Queries"])
-def get_low_score_students(course: str, threshold: int = 30, _: AuthUser = Depends(get_current_user)):
+async def get_low_score_students(course: str, threshold: int = 30, _: AuthUser = Depends(get_current_user)):
     """Get students with low scores in a specific course (requires authentication)"""
-    cache_key = CacheManager.make_cache_key("students:low_scores", {"course": course, "threshold": threshold})
-    cached = CacheManager.get(cache_key)
-    if cached is not None:
-        return cached
-    result = manager.get_low_score_students_by_course(course, threshold)
-    CacheManager.set(cache_key, result)
-    return result
+    return (await load_low_score_students(course, threshold)).to_response()
+
+
+# Service statistics
+@app.get("/stats", tags=["Info"])
+async def get_stats(key: Optional[str] = None, _: AuthUser = Depends(get_current_user)):
+    """
+    Get database pool and cache statistics (requires authentication)
+
+    Parameters:
+    - key: Redis key of a cached response (these start with CacheManager.KEY_PREFIX); its
+      codec, raw and stored size are reported in cache_entry, null if it is not cached
+    """
+    stats = {
+        "database": get_pool_stats(engine),
+        "database_async": get_pool_stats(async_manager.engine.sync_engine),
+        "token_cache": token_cache.stats(),
+        "token_revocations": revoked_tokens.stats(),
+        "password_hasher": password_hasher.stats(),
+        "login_rate_limit": login_rate_limiter.stats(),
+        "session_sweeper": session_sweeper.stats(),
+        "cache_l1": local_cache.stats(),
+        "cache_codec": CacheManager.codec_stats(),
+        "cache_warmer": cache_warmer.stats(),
+        "student_id_filter": student_id_filter.stats()
+    }
+    if key is not None:
+        stats["cache_entry"] = await AsyncCacheManager.describe(key)
+    return stats
 
 
 # Root endpoint
@@ -912,6 +3402,9 @@ def root():
                 "GET /courses/unique",
                 "GET /faculty/{faculty}/average-score",
                 "GET /courses/{course}/low-scores"
+            ],
+            "Info": [
+                "GET /stats"
             ]
         }
     }
@@ -924,16 +3417,17 @@ def test_cli():
     print("\nRunning tests...")
 
     # Get all students count
-    all_students = manager.get_all_students()
-    print(f"Total students: {len(all_students)}")
+    total = manager.count_students()
+    print(f"Total students: {total}")
 
-    if all_students:
+    if total:
+        first_students = manager.get_students_page(3)
         print("\nFirst 3 students:")
-        for s in all_students[:3]:
+        for s in first_students:
             print(f"  {s['id']}: {s['last_name']} {s['first_name']} ({s['faculty']})")
 
         # Test faculty query
-        first_faculty = all_students[0]['faculty']
+        first_faculty = first_students[0]['faculty']
         faculty_students = manager.get_students_by_faculty(first_faculty)
         print(f"\nStudents in {first_faculty}: {len(faculty_students)}")
 
@@ -957,15 +3451,15 @@ if __name__ == '__main__':
     import uvicorn
 
     # Check if database needs initial population
-    all_students = manager.get_all_students()
-    if len(all_students) == 0:
+    if manager.count_students() == 0:
         try:
-            manager.populate_from_csv('students.csv')
-            print("Database populated from CSV!")
+            stats = manager.populate_from_csv('students.csv')
+            print(f"Database populated from CSV! "
+                  f"{stats['records_imported']} rows, {stats['rows_per_second']} rows/s")
         except FileNotFoundError:
             print("students.csv not found. Starting with empty database.")
 
-    print(f"Total students in database: {len(manager.get_all_students())}")
+    print(f"Total students in database: {manager.count_students()}")
     print("\nStarting FastAPI server...")
     print("API Documentation available at: http://localhost:8000/docs")
 
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Тесты ключей кэша AsyncCacheManager.make_cache_key - пути, которым
+пользуются эндпоинты.
+
+Ключ должен быть одинаковым во всех процессах (uvicorn воркерах),
+независимо от PYTHONHASHSEED, иначе воркеры не видят записи друг друга.
+
+Каждый "воркер" - отдельный процесс python с собственным PYTHONHASHSEED,
+база данных - временный файл, students.db не используется.
+"""
+
+import sys
+sys.stdout.reconfigure(encoding='utf-8')
+
+import json
+import os
+import subprocess
+import tempfile
+import uuid
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+# Метка запуска в параметрах ключей, чтобы записи прошлых запусков не мешали
+RUN_ID = uuid.uuid4().hex
+
+# ============================================================================
+# Вспомогательные функции
+# ============================================================================
+
+def run_worker(code: str, hash_seed: int, db_path: str, *args: str) -> dict:
+    """Выполнить код в отдельном процессе и вернуть его JSON-вывод (последняя строка)"""
+    env = dict(os.environ, PYTHONHASHSEED=str(hash_seed), DATABASE_URL=f"sqlite:///{db_path}",
+               CACHE_TEST_RUN=RUN_ID)
+    result = subprocess.run(
+        [sys.executable, "-c", code, *args],
+        cwd=HERE, env=env, capture_output=True, text=True, encoding='utf-8', timeout=60
+    )
+    if result.returncode != 0:
+        raise AssertionError(f"Процесс завершился с ошибкой:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def assert_equal(actual, expected, message: str = ""):
+    """Проверка равенства значений"""
+    if actual != expected:
+        raise AssertionError(f"❌ {message}\n  Ожидалось: {expected}\n  Получено: {actual}")
+    print(f"✓ {message}")
+
+
+KEY_CODE = """
+import asyncio, json
+from main import AsyncCacheManager
+
+async def main():
+    return {
+        'by_faculty': await AsyncCacheManager.make_cache_key('students:by_faculty', {'faculty': 'АВТФ'}),
+        'low_scores': await AsyncCacheManager.make_cache_key('students:low_scores',
+                                                             {'threshold': 30, 'course': 'Физика'}),
+    }
+print(json.dumps(asyncio.run(main())))
+"""
+
+NAMESPACED_KEY_CODE = """
+import asyncio, json
+from main import AsyncCacheManager
+
+async def main():
+    return {
+        'by_faculty': await AsyncCacheManager.make_cache_key('students:by_faculty', {'faculty': 'АВТФ'},
+                                                             namespaces=('faculty:АВТФ',)),
+        'low_scores': await AsyncCacheManager.make_cache_key('students:low_scores',
+                                                             {'threshold': 30, 'course': 'Физика'},
+                                                             namespaces=('course:Физика',)),
+    }
+print(json.dumps(asyncio.run(main())))
+"""
+
+# Воркер вычисляет значение через get_or_compute, как эндпоинты;
+# при попадании в кэш compute не вызывается
+COMPUTE_CODE = """
+import asyncio, json, os, sys
+from main import AsyncCacheManager, REDIS_AVAILABLE
+
+async def main():
+    key = await AsyncCacheManager.make_cache_key('test:shared_key',
+                                                 {'faculty': 'ФПМИ', 'run': os.environ['CACHE_TEST_RUN']},
+                                                 ('faculty:ФПМИ',))
+    computed = []
+
+    async def compute():
+        computed.append(True)
+        return [{'id': int(sys.argv[1])}]
+
+    entry = await AsyncCacheManager.get_or_compute(key, compute, 'students:by_faculty')
+    return {'redis': REDIS_AVAILABLE, 'key': key, 'value': json.loads(entry.body), 'computed': bool(computed)}
+print(json.dumps(asyncio.run(main())))
+"""
+
+INVALIDATE_CODE = """
+import asyncio, json
+from main import AsyncCacheManager
+
+async def main():
+    return {'invalidated': await AsyncCacheManager.invalidate('faculty:ФПМИ')}
+print(json.dumps(asyncio.run(main())))
+"""
+
+# ============================================================================
+# Тесты
+# ============================================================================
+
+class TestCacheKeys:
+    """Тесты стабильности ключей кэша между процессами"""
+
+    def __init__(self):
+        self.test_count = 0
+        self.passed_count = 0
+        self.skipped_count = 0
+        self.workdir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.workdir, "cache_keys.db")
+
+    def test_1_same_key_in_different_processes(self):
+        """ТЕСТ 1: Ключи совпадают в процессах с разным PYTHONHASHSEED"""
+        self.test_count += 1
+        try:
+            print("\n" + "="*80)
+            print("[ТЕСТ 1] make_cache_key - одинаковые ключи в разных процессах")
+            print("="*80)
+
+            keys_1 = run_worker(KEY_CODE, 1, self.db_path)
+            keys_2 = run_worker(KEY_CODE, 2, self.db_path)
+            print(f"Ключи воркера 1: {keys_1}")
+
+            assert_equal(keys_2, keys_1, "Ключи воркеров совпадают")
+            self.passed_count += 1
+            return True
+
+        except Exception as e:
+            print(f"❌ ТЕСТ 1 НЕ ПРОЙДЕН: {str(e)}")
+            return False
+
+    def test_2_workers_share_cache_hits(self):
+        """ТЕСТ 2: Запись одного воркера - попадание в кэш для другого"""
+        self.test_count += 1
+        try:
+            print("\n" + "="*80)
+            print("[ТЕСТ 2] AsyncCacheManager.get_or_compute - воркеры используют общие записи в Redis")
+            print("="*80)
+
+            first = run_worker(COMPUTE_CODE, 11, self.db_path, "1")
+            if not first['redis']:
+                print("⚠ Redis недоступен, тест пропущен")
+                self.skipped_count += 1
+                return True
+
+            assert_equal(first['computed'], True, "Воркер 1 вычислил значение и записал его в кэш")
+            second = run_worker(COMPUTE_CODE, 22, self.db_path, "2")
+            assert_equal(second['key'], first['key'], "Воркер 2 строит тот же ключ")
+            assert_equal(second['computed'], False, "Воркер 2 не вычислял значение")
+            assert_equal(second['value'], [{'id': 1}], "Воркер 2 получил значение воркера 1 из кэша")
+
+            self.passed_count += 1
+            return True
+
+        except Exception as e:
+            print(f"❌ ТЕСТ 2 НЕ ПРОЙДЕН: {str(e)}")
+            return False
+
+    def test_3_same_namespaced_key_in_different_processes(self):
+        """ТЕСТ 3: Ключи с поколениями пространств имен совпадают в разных процессах"""
+        self.test_count += 1
+        try:
+            print("\n" + "="*80)
+            print("[ТЕСТ 3] make_cache_key(namespaces=...) - одинаковые ключи в разных процессах")
+            print("="*80)
+
+            keys_1 = run_worker(NAMESPACED_KEY_CODE, 3, self.db_path)
+            keys_2 = run_worker(NAMESPACED_KEY_CODE, 4, self.db_path)
+            print(f"Ключи воркера 1: {keys_1}")
+
+            assert_equal(":g" in keys_1['by_faculty'], True, "Ключ содержит поколения пространств имен")
+            assert_equal(keys_2, keys_1, "Ключи воркеров совпадают")
+            self.passed_count += 1
+            return True
+
+        except Exception as e:
+            print(f"❌ ТЕСТ 3 НЕ ПРОЙДЕН: {str(e)}")
+            return False
+
+
+    def test_4_invalidation_changes_key_in_other_workers(self):
+        """ТЕСТ 4: После invalidate другой воркер строит новый ключ и вычисляет значение заново"""
+        self.test_count += 1
+        try:
+            print("\n" + "="*80)
+            print("[ТЕСТ 4] AsyncCacheManager.invalidate - новые ключи во всех воркерах")
+            print("="*80)
+
+            before = run_worker(COMPUTE_CODE, 31, self.db_path, "1")
+            if not before['redis']:
+                print("⚠ Redis недоступен, тест пропущен")
+                self.skipped_count += 1
+                return True
+
+            invalidated = run_worker(INVALIDATE_CODE, 32, self.db_path)
+            assert_equal(invalidated['invalidated'], True, "Воркер 2 увеличил поколение faculty:ФПМИ")
+            after = run_worker(COMPUTE_CODE, 33, self.db_path, "3")
+            assert_equal(after['key'] != before['key'], True, "Воркер 3 строит новый ключ")
+            assert_equal(after['computed'], True, "Воркер 3 вычислил значение заново")
+            assert_equal(after['value'], [{'id': 3}], "Воркер 3 получил новое значение")
+
+            self.passed_count += 1
+            return True
+
+        except Exception as e:
+            print(f"❌ ТЕСТ 4 НЕ ПРОЙДЕН: {str(e)}")
+            return False
+
+def run_all_tests():
+    """Запустить все тесты ключей кэша"""
+    test_obj = TestCacheKeys()
+    test_methods = [method for method in dir(test_obj) if method.startswith('test_') and callable(getattr(test_obj, method))]
+    for method_name in sorted(test_methods):
+        getattr(test_obj, method_name)()
+
+    print(f"\nПройдено: {test_obj.passed_count}/{test_obj.test_count}, пропущено: {test_obj.skipped_count}")
+    return test_obj.passed_count + test_obj.skipped_count == test_obj.test_count
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
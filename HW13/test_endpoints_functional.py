@@ -10,6 +10,11 @@
 5. GET /students/faculty/{faculty} - получение студентов по факультету
 
 Для каждого эндпойнта разработано по 2+ функциональных теста.
+
+Дополнительно проверяется поведение кэша и защиты входа:
+6. Инвалидация кэша при переводе студента на другой факультет и курс
+7. Кэширование "не найдено" для GET /students/{student_id}
+8. Ограничение частоты попыток входа и регистрации (429)
 """
 
 import sys
@@ -18,7 +23,7 @@ sys.stdout.reconfigure(encoding='utf-8')
 import requests
 import json
 import time
-from typing import Dict, Any
+from typing import Dict, Any, Callable
 
 BASE_URL = "http://localhost:8000"
 
@@ -50,6 +55,19 @@ def assert_greater(actual: Any, expected: Any, message: str = ""):
         raise AssertionError(f"❌ {message}\n  {actual} > {expected}")
     print(f"✓ {message}")
 
+def assert_eventually(fetch: Callable[[], Any], expected: Any, message: str = "", timeout: float = 2.0):
+    """Проверка что fetch() вернет expected в течение timeout секунд
+
+    Другие воркеры узнают об инвалидации через Redis pub/sub, поэтому запрос
+    сразу после записи может попасть в воркер, еще не получивший сообщение.
+    """
+    deadline = time.monotonic() + timeout
+    actual = fetch()
+    while actual != expected and time.monotonic() < deadline:
+        time.sleep(0.05)
+        actual = fetch()
+    assert_equal(actual, expected, message)
+
 # ============================================================================
 # ТЕСТ 1: POST /auth/register - Регистрация пользователя
 # ============================================================================
@@ -812,6 +830,303 @@ class TestGetStudentsByFaculty:
             return False
 
 
+def register_and_login(prefix: str) -> str:
+    """Зарегистрировать нового пользователя и вернуть его access token"""
+    username = f"{prefix}_{int(time.time() * 1000)}"
+    password = "password123"
+    requests.post(
+        f"{BASE_URL}/auth/register",
+        json={
+            "username": username,
+            "password": password,
+            "email": f"{username}@test.com"
+        },
+        timeout=10
+    )
+    response = requests.post(
+        f"{BASE_URL}/auth/login",
+        json={
+            "username": username,
+            "password": password
+        },
+        timeout=10
+    )
+    return response.json()['access_token']
+
+
+# ============================================================================
+# ТЕСТ 6: Инвалидация кэша при изменении студента
+# ============================================================================
+
+class TestCacheInvalidation:
+    """Кэшированные ответы меняются сразу после записи"""
+
+    def __init__(self):
+        self.test_count = 0
+        self.passed_count = 0
+        self.token = None
+
+    def get_auth_token(self):
+        """Получить токен авторизации"""
+        if not self.token:
+            self.token = register_and_login("cache_user")
+        return self.token
+
+    def get(self, path: str, **params):
+        """GET запрос с авторизацией, возвращает JSON ответа"""
+        response = requests.get(
+            f"{BASE_URL}{path}",
+            params=params,
+            headers={"Authorization": f"Bearer {self.get_auth_token()}"},
+            timeout=10
+        )
+        assert_status(response, 200, f"GET {path}")
+        return response.json()
+
+    def test_1_update_faculty_and_course(self):
+        """ТЕСТ 6.1: Перевод студента обновляет средние баллы, списки и курсы"""
+        self.test_count += 1
+        student_id = None
+        try:
+            print("\n" + "="*80)
+            print("[ТЕСТ 6.1] PUT /students/{student_id} - Инвалидация старого и нового факультета")
+            print("="*80)
+
+            token = self.get_auth_token()
+            headers = {"Authorization": f"Bearer {token}"}
+            suffix = int(time.time() * 1000)
+            old_faculty, new_faculty = f"ФАК_СТАРЫЙ_{suffix}", f"ФАК_НОВЫЙ_{suffix}"
+            old_course, new_course = f"Курс_старый_{suffix}", f"Курс_новый_{suffix}"
+
+            response = requests.post(
+                f"{BASE_URL}/students",
+                json={
+                    "last_name": "Кэшев",
+                    "first_name": "Петр",
+                    "faculty": old_faculty,
+                    "course": old_course,
+                    "score": 10
+                },
+                headers=headers,
+                timeout=10
+            )
+            assert_status(response, 200, "Студент создан")
+            student_id = response.json()['id']
+
+            # Заполняем кэш ответами до изменения
+            assert_equal(self.get(f"/faculty/{old_faculty}/average-score")['average_score'], 10,
+                         "Средний балл старого факультета 10")
+            assert_equal(self.get(f"/faculty/{new_faculty}/average-score")['average_score'], 0,
+                         "Новый факультет пока пуст")
+            assert_equal([s['id'] for s in self.get(f"/courses/{old_course}/low-scores")], [student_id],
+                         "Студент в списке низких баллов старого курса")
+            assert_equal(self.get(f"/courses/{new_course}/low-scores"), [],
+                         "Список низких баллов нового курса пуст")
+            assert_in(old_course, self.get("/courses/unique"), "Старый курс в списке курсов")
+
+            response = requests.put(
+                f"{BASE_URL}/students/{student_id}",
+                json={"faculty": new_faculty, "course": new_course, "score": 20},
+                headers=headers,
+                timeout=10
+            )
+            assert_status(response, 200, "Студент переведен")
+
+            assert_eventually(lambda: self.get(f"/faculty/{old_faculty}/average-score")['average_score'], 0,
+                              "Старый факультет пуст после перевода")
+            assert_eventually(lambda: self.get(f"/faculty/{new_faculty}/average-score")['average_score'], 20,
+                              "Средний балл нового факультета 20")
+            assert_eventually(lambda: self.get(f"/courses/{old_course}/low-scores"), [],
+                              "Список низких баллов старого курса пуст")
+            assert_eventually(lambda: [(s['id'], s['score']) for s in self.get(f"/courses/{new_course}/low-scores")],
+                              [(student_id, 20)], "Студент с новым баллом в списке нового курса")
+
+            def course_listing():
+                courses = self.get("/courses/unique")
+                return new_course in courses, old_course in courses
+
+            assert_eventually(course_listing, (True, False), "Новый курс в списке курсов, старого больше нет")
+
+            self.passed_count += 1
+            return True
+
+        except Exception as e:
+            print(f"❌ ТЕСТ 6.1 НЕ ПРОЙДЕН: {str(e)}")
+            return False
+
+        finally:
+            if student_id is not None:
+                requests.delete(f"{BASE_URL}/students/{student_id}",
+                                headers={"Authorization": f"Bearer {self.get_auth_token()}"}, timeout=10)
+
+
+# ============================================================================
+# ТЕСТ 7: Кэширование отсутствующих студентов
+# ============================================================================
+
+class TestNegativeCache:
+    """Ответ 404 кэшируется, но не скрывает появившегося студента"""
+
+    def __init__(self):
+        self.test_count = 0
+        self.passed_count = 0
+        self.token = None
+
+    def get_auth_token(self):
+        """Получить токен авторизации"""
+        if not self.token:
+            self.token = register_and_login("negative_cache_user")
+        return self.token
+
+    def create_student(self, last_name: str) -> Dict:
+        """Создать студента и вернуть его данные"""
+        response = requests.post(
+            f"{BASE_URL}/students",
+            json={
+                "last_name": last_name,
+                "first_name": "Анна",
+                "faculty": "ФПМИ",
+                "course": "Физика",
+                "score": 70
+            },
+            headers={"Authorization": f"Bearer {self.get_auth_token()}"},
+            timeout=10
+        )
+        assert_status(response, 200, f"Студент {last_name} создан")
+        return response.json()
+
+    def get_student(self, student_id: int) -> requests.Response:
+        """GET /students/{student_id}"""
+        return requests.get(
+            f"{BASE_URL}/students/{student_id}",
+            headers={"Authorization": f"Bearer {self.get_auth_token()}"},
+            timeout=10
+        )
+
+    def test_1_missing_student_repeated(self):
+        """ТЕСТ 7.1: Повторный запрос несуществующего ID снова возвращает 404"""
+        self.test_count += 1
+        try:
+            print("\n" + "="*80)
+            print("[ТЕСТ 7.1] GET /students/{student_id} - Повторный запрос отсутствующего ID")
+            print("="*80)
+
+            missing_id = 2_000_000_000
+            for attempt in (1, 2, 3):
+                assert_status(self.get_student(missing_id), 404, f"Запрос {attempt}: студент не найден")
+
+            self.passed_count += 1
+            return True
+
+        except Exception as e:
+            print(f"❌ ТЕСТ 7.1 НЕ ПРОЙДЕН: {str(e)}")
+            return False
+
+    def test_2_deleted_then_created(self):
+        """ТЕСТ 7.2: Закэшированный 404 сбрасывается при создании студента"""
+        self.test_count += 1
+        student_ids = []
+        try:
+            print("\n" + "="*80)
+            print("[ТЕСТ 7.2] GET /students/{student_id} - 404 после удаления, 200 после создания")
+            print("="*80)
+
+            headers = {"Authorization": f"Bearer {self.get_auth_token()}"}
+            student = self.create_student("Удаленный")
+            student_ids.append(student['id'])
+            assert_status(self.get_student(student['id']), 200, "Созданный студент найден")
+
+            response = requests.delete(f"{BASE_URL}/students/{student['id']}", headers=headers, timeout=10)
+            assert_status(response, 200, "Студент удален")
+            # Второй запрос обслуживается закэшированным "не найдено"
+            assert_eventually(lambda: self.get_student(student['id']).status_code, 404,
+                              "Удаленный студент не найден")
+            assert_status(self.get_student(student['id']), 404, "Удаленный студент не найден повторно")
+
+            # SQLite может выдать новому студенту ID удаленного
+            created = self.create_student("Новый")
+            student_ids.append(created['id'])
+            assert_eventually(lambda: self.get_student(created['id']).status_code, 200,
+                              f"Новый студент {created['id']} найден")
+            assert_equal(self.get_student(created['id']).json()['last_name'], "Новый",
+                         "Получены данные нового студента")
+
+            self.passed_count += 1
+            return True
+
+        except Exception as e:
+            print(f"❌ ТЕСТ 7.2 НЕ ПРОЙДЕН: {str(e)}")
+            return False
+
+        finally:
+            for student_id in student_ids:
+                requests.delete(f"{BASE_URL}/students/{student_id}",
+                                headers={"Authorization": f"Bearer {self.get_auth_token()}"}, timeout=10)
+
+
+# ============================================================================
+# ТЕСТ 8: Ограничение частоты попыток входа и регистрации
+# ============================================================================
+
+class TestLoginRateLimit:
+    """Ограничение числа попыток на имя пользователя
+
+    Вход и регистрация защищены одним ограничителем. Тест расходует попытки
+    регистрации, а не входа, чтобы не исчерпать лимит входа с одного IP,
+    которым пользуются остальные тесты при повторном запуске.
+    """
+
+    def __init__(self):
+        self.test_count = 0
+        self.passed_count = 0
+
+    def register(self, username: str) -> requests.Response:
+        """POST /auth/register"""
+        return requests.post(
+            f"{BASE_URL}/auth/register",
+            json={
+                "username": username,
+                "password": "password123",
+                "email": f"{username.lower()}@test.com"
+            },
+            timeout=10
+        )
+
+    def test_1_username_limit(self):
+        """ТЕСТ 8.1: Лишняя попытка под одним именем получает 429, другие имена - нет"""
+        self.test_count += 1
+        try:
+            print("\n" + "="*80)
+            print("[ТЕСТ 8.1] POST /auth/register - Ограничение попыток на имя пользователя")
+            print("="*80)
+
+            # Лимит на имя (LOGIN_RATE_LIMIT_PER_USERNAME) сообщает /stats
+            token = register_and_login("rate_limit_user")
+            stats = requests.get(f"{BASE_URL}/stats", headers={"Authorization": f"Bearer {token}"}, timeout=10)
+            assert_status(stats, 200, "Получена статистика")
+            limit = stats.json()['login_rate_limit']['limits']['username']
+
+            username = f"rate_limited_{int(time.time() * 1000)}"
+            assert_status(self.register(username), 200, "Первая попытка регистрирует пользователя")
+            for attempt in range(2, limit + 1):
+                response = self.register(username)
+                if response.status_code != 400:
+                    raise AssertionError(f"❌ Попытка {attempt} в пределах лимита: статус {response.status_code}")
+            print(f"✓ Повторные попытки в пределах лимита ({limit}) отклонены с 400")
+
+            response = self.register(username.upper())
+            assert_status(response, 429, "Попытка сверх лимита (имя в другом регистре) отклонена")
+            assert_greater(int(response.headers.get("Retry-After", 0)), 0, "Ответ содержит Retry-After")
+
+            assert_status(self.register(f"{username}_other"), 200, "Лимит другого имени не исчерпан")
+
+            self.passed_count += 1
+            return True
+
+        except Exception as e:
+            print(f"❌ ТЕСТ 8.1 НЕ ПРОЙДЕН: {str(e)}")
+            return False
+
 # ============================================================================
 # ГЛАВНАЯ ФУНКЦИЯ
 # ============================================================================
@@ -834,6 +1149,9 @@ def run_all_tests():
         ("ТЕСТ 3: POST /students", TestCreateStudent()),
         ("ТЕСТ 4: GET /students", TestGetAllStudents()),
         ("ТЕСТ 5: GET /students/faculty/{faculty}", TestGetStudentsByFaculty()),
+        ("ТЕСТ 6: Инвалидация кэша при изменении студента", TestCacheInvalidation()),
+        ("ТЕСТ 7: Кэширование отсутствующих студентов", TestNegativeCache()),
+        ("ТЕСТ 8: Ограничение частоты попыток", TestLoginRateLimit()),
     ]
 
     total_tests = 0